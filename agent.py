@@ -1,36 +1,189 @@
 import numpy as np
-import random
-from config import Config
+from collections import deque
+from config import DEFAULT_CONFIG
+from stats import EpisodeHistory
+from rng import make_rng, RandomStream
+
+LEARNING_MODES = ('q', 'nstep', 'lambda')
+
+class SparseQTable:
+    def __init__(self, state_space_size, action_space_size, capacity=1024, rng=None):
+        self.state_space_size = tuple(state_space_size)
+        self.action_space_size = action_space_size
+        self.rng = make_rng(rng)
+        
+        strides = []
+        stride = 1
+        for size in reversed(self.state_space_size):
+            strides.append(stride)
+            stride *= size
+        self.strides = tuple(reversed(strides))
+        self._stride_array = np.array(self.strides, dtype=np.int64)
+        
+        self.values = np.empty((capacity, action_space_size))
+        self.keys = np.empty(capacity, dtype=np.int64)
+        self.index = {}
+    
+    @classmethod
+    def from_arrays(cls, state_space_size, keys, values, rng=None):
+        table = cls(state_space_size, values.shape[1], capacity=0, rng=rng)
+        table.values = values
+        table.keys = np.asarray(keys, dtype=np.int64)
+        table.index = {int(key): row for row, key in enumerate(table.keys)}
+        return table
+    
+    def __len__(self):
+        return len(self.index)
+    
+    @property
+    def nbytes(self):
+        return self.values.nbytes + self.keys.nbytes
+    
+    def pack(self, state):
+        key = 0
+        for value, stride in zip(state, self.strides):
+            key += value * stride
+        return int(key)
+    
+    def pack_batch(self, states):
+        return np.asarray(states, dtype=np.int64) @ self._stride_array
+    
+    def unpack(self, key):
+        return tuple(int(v) for v in np.unravel_index(key, self.state_space_size))
+    
+    def _insert(self, key):
+        row = len(self.index)
+        if row >= len(self.values):
+            capacity = max(2 * len(self.values), 1024)
+            values = np.empty((capacity, self.action_space_size))
+            values[:row] = self.values[:row]
+            keys = np.empty(capacity, dtype=np.int64)
+            keys[:row] = self.keys[:row]
+            self.values = values
+            self.keys = keys
+        
+        self.values[row] = self.rng.uniform(-0.1, 0.1, self.action_space_size)
+        self.keys[row] = key
+        self.index[key] = row
+        return row
+    
+    def row_of(self, state):
+        key = self.pack(state)
+        row = self.index.get(key)
+        if row is None:
+            row = self._insert(key)
+        return row
+    
+    def rows(self, states):
+        index = self.index
+        keys = self.pack_batch(states).tolist()
+        rows = np.empty(len(keys), dtype=np.intp)
+        for i, key in enumerate(keys):
+            row = index.get(key)
+            if row is None:
+                row = self._insert(key)
+            rows[i] = row
+        return rows
+    
+    def __getitem__(self, state):
+        row = self.row_of(state)
+        return self.values[row]
+    
+    def items(self):
+        for key, row in self.index.items():
+            yield self.unpack(key), self.values[row]
+    
+    def to_arrays(self):
+        size = len(self.index)
+        return self.keys[:size], self.values[:size]
+
 
 class QLearningAgent:
-    def __init__(self, state_space_size, action_space_size):
-        self.state_space_size = state_space_size
+    def __init__(self, state_space_size, action_space_size, q_backend=None, rng=None, config=DEFAULT_CONFIG):
+        q_backend = q_backend or config.Q_TABLE_BACKEND
+        self.rng = make_rng(rng)
+        self.random = RandomStream(self.rng)
+        self.state_space_size = tuple(state_space_size)
         self.action_space_size = action_space_size
-        self.learning_rate = Config.LEARNING_RATE
-        self.discount_factor = Config.DISCOUNT_FACTOR
-        self.exploration_rate = Config.EXPLORATION_RATE
-        self.exploration_decay = Config.EXPLORATION_DECAY
-        self.min_exploration_rate = Config.MIN_EXPLORATION_RATE
-        
-        self.q_table = np.random.uniform(
-            low=-0.1, 
-            high=0.1, 
-            size=(state_space_size[0], state_space_size[1], action_space_size)
-        )
+        self.learning_rate = config.LEARNING_RATE
+        self.discount_factor = config.DISCOUNT_FACTOR
+        self.exploration_rate = config.EXPLORATION_RATE
+        self.exploration_decay = config.EXPLORATION_DECAY
+        self.min_exploration_rate = config.MIN_EXPLORATION_RATE
         
-        self.episode_rewards = []
-        self.episode_steps = []
-        self.exploration_rates = []
+        if q_backend == 'sparse':
+            self.q_table = SparseQTable(state_space_size, action_space_size, rng=self.rng)
+        elif q_backend == 'dense':
+            self.q_table = self.rng.uniform(
+                low=-0.1, 
+                high=0.1, 
+                size=(*state_space_size, action_space_size)
+            )
+        else:
+            raise ValueError(f"Tip de tabela Q necunoscut: {q_backend}")
+        self.q_backend = q_backend
+        
+        self.history = EpisodeHistory(config.STATS_RING_SIZE)
+        self.max_delta = 0.0
+        self.trace_threshold = config.TRACE_THRESHOLD
+        self.set_learning_mode(config.LEARNING_MODE, config.N_STEP, config.TRACE_LAMBDA)
+    
+    def set_learning_mode(self, mode, n_step=None, trace_lambda=None):
+        if mode not in LEARNING_MODES:
+            raise ValueError(f"Mod de invatare necunoscut: {mode}")
+        
+        self.learning_mode = mode
+        if n_step is not None:
+            self.n_step = n_step
+        if trace_lambda is not None:
+            self.trace_lambda = trace_lambda
+        
+        self._pending = deque()
+        self._last_next_state = None
+        self.traces = None
+        self._trace_source = None
+        self._active_buffer = np.zeros(0, dtype=np.intp)
+        self._active_count = 0
+        
+        # metodele se leaga o singura data, la alegerea modului: modul 'q' pastreaza calea directa
+        self.__dict__.pop('learn', None)
+        self.__dict__.pop('get_action', None)
+        if mode == 'nstep':
+            self.learn = self._learn_nstep
+        elif mode == 'lambda':
+            self.learn = self._learn_lambda
+            self.get_action = self._get_action_watkins
     
     def get_action(self, state):
-        if random.random() < self.exploration_rate:
-            return random.randint(0, self.action_space_size - 1)
+        if self.random.random() < self.exploration_rate:
+            return self.random.integers(self.action_space_size)
         else:
             state_idx = self._state_to_index(state)
             return np.argmax(self.q_table[state_idx])
     
+    def get_actions(self, states):
+        # la tabela rara, rows() poate realoca valorile; matricea se citeste dupa
+        rows = self._state_rows(states)
+        actions = np.argmax(self._q_matrix()[rows], axis=1)
+        explore = self.rng.random(len(actions)) < self.exploration_rate
+        actions[explore] = self.rng.integers(0, self.action_space_size, np.count_nonzero(explore))
+        return actions
+    
+    def get_greedy_action(self, state):
+        return np.argmax(self.q_table[self._state_to_index(state)])
+    
     def _state_to_index(self, state):
-        return (state[0], state[1])
+        return tuple(state)
+    
+    def _state_rows(self, states):
+        if self.q_backend == 'sparse':
+            return self.q_table.rows(states)
+        return np.ravel_multi_index(tuple(np.asarray(states).T), self.state_space_size)
+    
+    def _q_matrix(self):
+        if self.q_backend == 'sparse':
+            return self.q_table.values
+        return self.q_table.reshape(-1, self.action_space_size)
     
     def learn(self, state, action, reward, next_state, done):
         state_idx = self._state_to_index(state)
@@ -44,7 +197,160 @@ class QLearningAgent:
             max_future_q = np.max(self.q_table[next_state_idx])
             target_q = reward + self.discount_factor * max_future_q
         
-        self.q_table[state_idx][action] = current_q + self.learning_rate * (target_q - current_q)
+        delta = self.learning_rate * (target_q - current_q)
+        self.q_table[state_idx][action] = current_q + delta
+        
+        delta = abs(delta)
+        if delta > self.max_delta:
+            self.max_delta = delta
+    
+    def _apply(self, state_idx, action, target_q):
+        values = self.q_table[state_idx]
+        delta = self.learning_rate * (target_q - values[action])
+        values[action] += delta
+        
+        delta = abs(delta)
+        if delta > self.max_delta:
+            self.max_delta = delta
+    
+    def _learn_nstep(self, state, action, reward, next_state, done):
+        pending = self._pending
+        pending.append((self._state_to_index(state), action, reward))
+        self._last_next_state = next_state
+        
+        if done:
+            self._flush_nstep(None)
+        elif len(pending) >= self.n_step:
+            self._nstep_update(np.max(self.q_table[self._state_to_index(next_state)]))
+    
+    def _nstep_update(self, bootstrap):
+        # returnul discountat al ferestrei, completat cu valoarea ultimei stari (0 la final de episod)
+        pending = self._pending
+        target_q = bootstrap
+        for _, _, reward in reversed(pending):
+            target_q = reward + self.discount_factor * target_q
+        
+        state_idx, action, _ = pending.popleft()
+        self._apply(state_idx, action, target_q)
+    
+    def _flush_nstep(self, next_state):
+        while self._pending:
+            bootstrap = 0.0 if next_state is None else np.max(self.q_table[self._state_to_index(next_state)])
+            self._nstep_update(bootstrap)
+    
+    def _trace_views(self):
+        # sursa este obiectul tabelei, nu o vedere noua: tabela densa se leaga o singura data,
+        # cea rara doar cand tabloul de valori a fost realocat
+        source = self.q_table.values if self.q_backend == 'sparse' else self.q_table
+        if source is not self._trace_source:
+            traces = np.zeros(source.shape)
+            if self.traces is not None:
+                # tabela rara a crescut: urmele existente raman pe aceleasi randuri
+                traces.reshape(-1)[:self.traces.size] = self.traces.reshape(-1)
+            self.traces = traces
+            self._trace_source = source
+            self._flat_table = source.reshape(-1)
+            self._flat_traces = traces.reshape(-1)
+            if len(self._active_buffer) != traces.size:
+                self._active_buffer = np.resize(self._active_buffer, traces.size)
+        return self._flat_table, self._flat_traces
+    
+    def _flat_index(self, state, action):
+        if self.q_backend == 'sparse':
+            row = self.q_table.row_of(state)
+        else:
+            row = 0
+            for value, size in zip(state, self.state_space_size):
+                row = row * size + value
+        return int(row) * self.action_space_size + int(action)
+    
+    def _learn_lambda(self, state, action, reward, next_state, done):
+        state_idx = self._state_to_index(state)
+        current_q = self.q_table[state_idx][action]
+        if done:
+            target_q = reward
+        else:
+            target_q = reward + self.discount_factor * np.max(self.q_table[self._state_to_index(next_state)])
+        
+        flat = self._flat_index(state_idx, action)
+        table, traces = self._trace_views()
+        if traces[flat] == 0.0:
+            self._active_buffer[self._active_count] = flat
+            self._active_count += 1
+        # urme inlocuitoare: perechea curenta revine la 1 in loc sa se acumuleze
+        traces[flat] = 1.0
+        
+        step = self.learning_rate * (target_q - current_q)
+        active = self._active_buffer[:self._active_count]
+        table[active] += step * traces[active]
+        
+        step = abs(step)
+        if step > self.max_delta:
+            self.max_delta = step
+        
+        if done:
+            self._clear_traces()
+    
+    def _get_action_watkins(self, state):
+        greedy = np.argmax(self.q_table[self._state_to_index(state)])
+        if self.random.random() < self.exploration_rate:
+            action = self.random.integers(self.action_space_size)
+        else:
+            action = greedy
+        
+        # Watkins: urmele se sting dupa o actiune de explorare
+        if self._active_count:
+            if action == greedy:
+                self._decay_traces()
+            else:
+                self._clear_traces()
+        return action
+    
+    def _decay_traces(self):
+        traces = self._flat_traces
+        active = self._active_buffer[:self._active_count]
+        values = traces[active] * (self.discount_factor * self.trace_lambda)
+        keep = values >= self.trace_threshold
+        traces[active] = values * keep
+        
+        # setul activ se compacteaza pe loc; urmele sub prag ies din set
+        kept = active[keep]
+        self._active_count = len(kept)
+        self._active_buffer[:self._active_count] = kept
+    
+    def _clear_traces(self):
+        if self.traces is not None:
+            self._flat_traces[self._active_buffer[:self._active_count]] = 0.0
+        self._active_count = 0
+    
+    def end_episode(self):
+        if self._pending:
+            self._flush_nstep(self._last_next_state)
+        if self._active_count:
+            self._clear_traces()
+    
+    def learn_batch(self, states, actions, rewards, next_states, dones, weights=None):
+        rows = self._state_rows(states)
+        next_rows = self._state_rows(next_states)
+        table = self._q_matrix()
+        actions = np.asarray(actions)
+        
+        max_future_q = table[next_rows].max(axis=1)
+        target_q = np.where(dones, rewards, rewards + self.discount_factor * max_future_q)
+        td_errors = target_q - table[rows, actions]
+        
+        # toate tintele folosesc tabela de dinaintea lotului; o pereche (stare, actiune)
+        # care apare de mai multe ori primeste o singura actualizare cu media erorilor TD
+        step_errors = td_errors if weights is None else td_errors * weights
+        flat = rows * self.action_space_size + actions
+        unique, inverse, counts = np.unique(flat, return_inverse=True, return_counts=True)
+        mean_errors = np.bincount(inverse, weights=step_errors) / counts
+        deltas = self.learning_rate * mean_errors
+        table.reshape(-1)[unique] += deltas
+        
+        if len(deltas):
+            self.max_delta = max(self.max_delta, float(np.abs(deltas).max()))
+        return td_errors
     
     def update_exploration_rate(self):
         self.exploration_rate = max(
@@ -52,15 +358,40 @@ class QLearningAgent:
             self.exploration_rate * self.exploration_decay
         )
     
+    def pop_max_delta(self):
+        max_delta = self.max_delta
+        self.max_delta = 0.0
+        return float(max_delta)
+    
     def record_episode(self, total_reward, steps):
-        self.episode_rewards.append(total_reward)
-        self.episode_steps.append(steps)
-        self.exploration_rates.append(self.exploration_rate)
+        self.end_episode()
+        self.history.append(reward=total_reward, steps=steps, exploration=self.exploration_rate)
+    
+    @property
+    def episode_rewards(self):
+        return self.history.column('reward')
+    
+    @property
+    def episode_steps(self):
+        return self.history.column('steps')
+    
+    @property
+    def exploration_rates(self):
+        return self.history.column('exploration')
     
     def get_best_policy(self):
-        policy = {}
-        for i in range(self.state_space_size[0]):
-            for j in range(self.state_space_size[1]):
-                best_action = np.argmax(self.q_table[i][j])
-                policy[(i, j)] = best_action
-        return policy
\ No newline at end of file
+        # -1 pentru starile pe care tabela rara nu le-a vizitat inca
+        if self.q_backend == 'sparse':
+            policy = np.full(self.state_space_size, -1, dtype=np.int64)
+            keys, values = self.q_table.to_arrays()
+            policy.reshape(-1)[keys] = np.argmax(values, axis=1)
+            return policy
+        return np.argmax(self.q_table, axis=-1)
+    
+    def get_state_values(self):
+        if self.q_backend == 'sparse':
+            state_values = np.full(self.state_space_size, np.nan)
+            keys, values = self.q_table.to_arrays()
+            state_values.reshape(-1)[keys] = values.max(axis=1)
+            return state_values
+        return np.max(self.q_table, axis=-1)
@@ -0,0 +1,51 @@
+import numpy as np
+from checkpoint import load_checkpoint
+
+
+def policy_delta(previous, current):
+    previous = np.asarray(previous)
+    current = np.asarray(current)
+    if previous.shape != current.shape:
+        raise ValueError(f"Politici cu forme diferite: {previous.shape} si {current.shape}")
+    
+    # starile nevizitate (-1 in politicile tabelelor rare) nu se compara
+    known = (previous >= 0) & (current >= 0)
+    changed = known & (previous != current)
+    states = int(np.count_nonzero(known))
+    changed_states = int(np.count_nonzero(changed))
+    return {
+        'states': states,
+        'changed': changed_states,
+        'fraction': changed_states / states if states else 0.0,
+    }
+
+
+def value_delta(previous, current):
+    difference = np.abs(np.asarray(current) - np.asarray(previous))
+    difference = difference[~np.isnan(difference)]
+    if not len(difference):
+        return {'max': 0.0, 'mean': 0.0}
+    return {'max': float(difference.max()), 'mean': float(difference.mean())}
+
+
+def compare_agents(previous, current):
+    result = policy_delta(previous.get_best_policy(), current.get_best_policy())
+    values = value_delta(previous.get_state_values(), current.get_state_values())
+    result['value_max'] = values['max']
+    result['value_mean'] = values['mean']
+    return result
+
+
+def compare_checkpoints(previous_path, current_path):
+    return compare_agents(load_checkpoint(previous_path, mmap=True), load_checkpoint(current_path, mmap=True))
+
+
+def convergence_episode(max_deltas, tolerance, patience):
+    calm = np.asarray(max_deltas) < tolerance
+    if len(calm) < patience:
+        return None
+    
+    # ferestre de `patience` episoade consecutive, toate sub prag
+    window_sums = np.convolve(calm, np.ones(patience, dtype=np.int64), mode='valid')
+    hits = np.flatnonzero(window_sums == patience)
+    return int(hits[0] + patience - 1) if len(hits) else None
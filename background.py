@@ -0,0 +1,83 @@
+import threading
+from collections import namedtuple
+import numpy as np
+
+TrainingSnapshot = namedtuple('TrainingSnapshot', [
+    'episode', 'maze', 'cat_path', 'mouse_path', 'rewards',
+    'exploration_rate', 'success', 'episodes_done', 'success_count', 'total_score', 'best_score',
+])
+
+
+class BackgroundTrainer:
+    def __init__(self, trainer, episodes=None, publish_every=None):
+        self.trainer = trainer
+        self.episodes = trainer.config.EPISODES if episodes is None else episodes
+        self.publish_every = max(1, publish_every or trainer.config.SNAPSHOT_EVERY)
+        
+        self.latest = None
+        self.published = 0
+        self.stop_requested = False
+        self.finished = False
+        self.thread = None
+        
+        self._recording = False
+        self._cat_path = []
+        self._mouse_path = []
+        self._rewards = []
+        self._maze = None
+    
+    def start(self):
+        self.thread = threading.Thread(target=self._run, name='q-learning-trainer', daemon=True)
+        self.thread.start()
+        return self
+    
+    def stop(self):
+        self.stop_requested = True
+        if self.thread is not None:
+            self.thread.join()
+    
+    def _run(self):
+        try:
+            remaining = self.episodes
+            while remaining > 0 and not self.stop_requested:
+                chunk = min(self.publish_every, remaining)
+                self.trainer.train(chunk, recorder=self)
+                remaining -= chunk
+        finally:
+            self.finished = True
+    
+    def start_episode(self, env):
+        self._recording = self.trainer.training_stats.count % self.publish_every == 0
+        if self._recording:
+            self._maze = np.array(env.maze, copy=True)
+            self._cat_path = [env.cat_pos]
+            self._mouse_path = [env.mouse_pos]
+            self._rewards = [0.0]
+    
+    def record_step(self, env, action, reward):
+        if self._recording:
+            self._cat_path.append(env.cat_pos)
+            self._mouse_path.append(env.mouse_pos)
+            self._rewards.append(reward)
+    
+    def end_episode(self, env, stats):
+        if not self._recording:
+            return
+        
+        row = stats[-1]
+        # publicarea este o simpla atribuire de referinta: cititorul vede mereu un snapshot complet
+        self.latest = TrainingSnapshot(
+            episode=row['episode'],
+            maze=self._maze,
+            cat_path=tuple(self._cat_path),
+            mouse_path=tuple(self._mouse_path),
+            rewards=tuple(self._rewards),
+            exploration_rate=row['exploration'],
+            success=row['success'],
+            episodes_done=stats.count,
+            success_count=int(stats.totals['success']),
+            total_score=stats.totals['reward'],
+            best_score=stats.maximums['reward'],
+        )
+        self.published += 1
+        self._recording = False
@@ -0,0 +1,63 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from q_learning import QLearningTrainer
+
+MODES = ('q', 'nstep', 'lambda')
+
+
+def run_until_target(mode, target, window, max_episodes, chunk, seed, overrides):
+    trainer = QLearningTrainer(seed=seed, config=Config(LEARNING_MODE=mode, **overrides))
+    
+    start = time.perf_counter()
+    reached = False
+    while trainer.training_stats.count < max_episodes:
+        trainer.train(chunk)
+        recent = trainer.training_stats['success'][-window:]
+        if len(recent) >= window and recent.mean() >= target:
+            reached = True
+            break
+    elapsed = time.perf_counter() - start
+    
+    return {
+        'mode': mode,
+        'seed': seed,
+        'reached_target': reached,
+        'episodes': trainer.training_stats.count,
+        'env_steps': trainer.env_steps,
+        'seconds': elapsed,
+        'us_per_step': elapsed / max(trainer.env_steps, 1) * 1e6,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Episoade si timp pana la rata de succes tinta: Q, n-step, Q(lambda)')
+    parser.add_argument('--target', type=float, default=0.7)
+    parser.add_argument('--window', type=int, default=200)
+    parser.add_argument('--max-episodes', type=int, default=5000)
+    parser.add_argument('--chunk', type=int, default=50)
+    parser.add_argument('--seeds', type=int, nargs='+', default=[0, 1, 2])
+    parser.add_argument('--n-step', type=int, default=Config.N_STEP)
+    parser.add_argument('--trace-lambda', type=float, default=Config.TRACE_LAMBDA)
+    parser.add_argument('--learning-rate', type=float, default=Config.LEARNING_RATE)
+    parser.add_argument('--reward-shaping', choices=('none', 'manhattan', 'path'), default=Config.REWARD_SHAPING)
+    args = parser.parse_args()
+    
+    overrides = {'N_STEP': args.n_step, 'TRACE_LAMBDA': args.trace_lambda, 'LEARNING_RATE': args.learning_rate,
+                 'REWARD_SHAPING': args.reward_shaping}
+    results = []
+    for mode in MODES:
+        for seed in args.seeds:
+            results.append(run_until_target(mode, args.target, args.window, args.max_episodes,
+                                            args.chunk, seed, overrides))
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
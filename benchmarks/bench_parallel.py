@@ -0,0 +1,30 @@
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from parallel import measure_scaling, print_scaling_report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Accelerarea antrenarii paralele in functie de numarul de workeri')
+    parser.add_argument('--episodes', type=int, default=2000)
+    parser.add_argument('--workers', type=int, nargs='+', default=None,
+                        help='Numerele de workeri masurate (implicit 1 2 4 si numarul de procesoare)')
+    parser.add_argument('--sync-interval', type=int, default=Config.SYNC_INTERVAL)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', metavar='FILE', help='Scrie rezultatele JSON in fisier')
+    args = parser.parse_args()
+    
+    report = measure_scaling(args.episodes, args.workers, args.sync_interval, args.seed)
+    print_scaling_report(report)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
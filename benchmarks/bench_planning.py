@@ -0,0 +1,70 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from main import STATE_ENCODERS, make_state_encoder
+from q_learning import QLearningTrainer
+
+
+def run_until_target(planning_steps, between_episodes, state, target, window, max_episodes, chunk, seed, overrides):
+    config = Config(PLANNING_STEPS=planning_steps, PLANNING_BETWEEN_EPISODES=between_episodes, **overrides)
+    trainer = QLearningTrainer(state_encoder=make_state_encoder(state), seed=seed, config=config)
+    
+    start = time.perf_counter()
+    reached = False
+    while trainer.training_stats.count < max_episodes:
+        trainer.train(chunk)
+        recent = trainer.training_stats['success'][-window:]
+        if len(recent) >= window and recent.mean() >= target:
+            reached = True
+            break
+    elapsed = time.perf_counter() - start
+    
+    return {
+        'planning_steps': planning_steps,
+        'between_episodes': between_episodes,
+        'state': state,
+        'seed': seed,
+        'reached_target': reached,
+        'episodes': trainer.training_stats.count,
+        'env_steps': trainer.env_steps,
+        'seconds': elapsed,
+        'model_pairs': len(trainer.model) if trainer.model is not None else 0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Pasi reali si timp pana la rata de succes tinta: Q vs Dyna-Q')
+    parser.add_argument('--planning-steps', type=int, nargs='+', default=[0, 5, 20])
+    parser.add_argument('--between-episodes', action='store_true',
+                        help='Ruleaza si varianta cu planificarea amanata la finalul episodului')
+    parser.add_argument('--state', choices=STATE_ENCODERS, default='distance')
+    parser.add_argument('--target', type=float, default=0.8)
+    parser.add_argument('--window', type=int, default=200)
+    parser.add_argument('--max-episodes', type=int, default=5000)
+    parser.add_argument('--chunk', type=int, default=50)
+    parser.add_argument('--seeds', type=int, nargs='+', default=[0, 1, 2])
+    parser.add_argument('--batch-size', type=int, default=Config.PLANNING_BATCH_SIZE)
+    parser.add_argument('--reward-shaping', choices=('none', 'manhattan', 'path'), default=Config.REWARD_SHAPING)
+    args = parser.parse_args()
+    
+    overrides = {'PLANNING_BATCH_SIZE': args.batch_size, 'REWARD_SHAPING': args.reward_shaping}
+    variants = [(steps, False) for steps in args.planning_steps]
+    if args.between_episodes:
+        variants += [(steps, True) for steps in args.planning_steps if steps > 0]
+    
+    results = []
+    for planning_steps, between_episodes in variants:
+        for seed in args.seeds:
+            results.append(run_until_target(planning_steps, between_episodes, args.state, args.target, args.window,
+                                            args.max_episodes, args.chunk, seed, overrides))
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from agent import QLearningAgent
+from environment import MazeEnvironment, DistanceStateEncoder, PositionStateEncoder, LocalViewStateEncoder
+
+ENCODERS = {
+    'distance': DistanceStateEncoder,
+    'position': PositionStateEncoder,
+    'local': LocalViewStateEncoder,
+}
+
+
+def collect_states(env, count):
+    states = []
+    env.reset()
+    for _ in range(count):
+        state, _, done = env.step(np.random.randint(4))
+        states.append(state)
+        if done:
+            env.reset()
+    return states
+
+
+def bench_backend(backend, encoder_name, size, operations):
+    env = MazeEnvironment(size, size, state_encoder=ENCODERS[encoder_name]())
+    states = collect_states(env, operations + 1)
+    
+    agent = QLearningAgent(env.state_shape, 4, q_backend=backend)
+    agent.exploration_rate = 0.0
+    
+    start = time.perf_counter()
+    for state in states[:-1]:
+        agent.get_action(state)
+    lookup_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    for state, next_state in zip(states[:-1], states[1:]):
+        agent.learn(state, 0, -0.05, next_state, False)
+    update_time = time.perf_counter() - start
+    
+    return {
+        'backend': backend,
+        'encoder': encoder_name,
+        'maze_size': size,
+        'lookup_ns': lookup_time / operations * 1e9,
+        'update_ns': update_time / operations * 1e9,
+        'table_bytes': int(agent.q_table.nbytes),
+        'stored_states': len(agent.q_table) if backend == 'sparse' else int(np.prod(env.state_shape)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Cost lookup/update pentru tabelele Q densa si rara')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[8, 32, 64])
+    parser.add_argument('--operations', type=int, default=20000)
+    args = parser.parse_args()
+    
+    results = []
+    for size in args.sizes:
+        for encoder_name in ENCODERS:
+            for backend in ('dense', 'sparse'):
+                if backend == 'dense' and encoder_name != 'distance' and size > 32:
+                    continue
+                results.append(bench_backend(backend, encoder_name, size, args.operations))
+    
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from q_learning import QLearningTrainer
+from replay import ReplayBuffer, PrioritizedReplayBuffer
+
+BUFFERS = {
+    'none': lambda: None,
+    'uniform': lambda: ReplayBuffer(state_dim=2),
+    'prioritized': lambda: PrioritizedReplayBuffer(state_dim=2),
+}
+
+
+def run_until_target(kind, target, window, max_episodes, chunk, replay_ratio, seed):
+    trainer = QLearningTrainer(replay_buffer=BUFFERS[kind](), replay_ratio=replay_ratio, seed=seed)
+    
+    start = time.perf_counter()
+    reached = False
+    while trainer.training_stats.count < max_episodes:
+        trainer.train(chunk)
+        recent = trainer.training_stats['success'][-window:]
+        if len(recent) >= window and recent.mean() >= target:
+            reached = True
+            break
+    elapsed = time.perf_counter() - start
+    
+    return {
+        'replay': kind,
+        'seed': seed,
+        'reached_target': reached,
+        'episodes': trainer.training_stats.count,
+        'env_steps': trainer.env_steps,
+        'seconds': elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Pasi reali si timp pana la rata de succes tinta, cu/fara replay')
+    parser.add_argument('--target', type=float, default=0.7)
+    parser.add_argument('--window', type=int, default=200)
+    parser.add_argument('--max-episodes', type=int, default=5000)
+    parser.add_argument('--chunk', type=int, default=50)
+    parser.add_argument('--replay-ratio', type=float, default=4)
+    parser.add_argument('--seeds', type=int, nargs='+', default=[0, 1, 2])
+    args = parser.parse_args()
+    
+    results = []
+    for kind in BUFFERS:
+        for seed in args.seeds:
+            results.append(run_until_target(kind, args.target, args.window, args.max_episodes,
+                                            args.chunk, args.replay_ratio, seed))
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,234 @@
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+from agent import QLearningAgent
+from environment import MazeEnvironment, BatchedMazeEnvironment
+from q_learning import QLearningTrainer
+
+DEFAULT_SIZES = (8, 32, 128, 512)
+QUICK_SIZES = (8, 32)
+
+
+def timed(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return time.perf_counter() - start
+
+
+def metric(value, unit, higher_is_better=True):
+    return {'value': value, 'unit': unit, 'higher_is_better': higher_is_better}
+
+
+def bench_env_step(size, steps, reward_shaping='manhattan'):
+    env = MazeEnvironment(size, size, reward_shaping=reward_shaping)
+    actions = np.random.randint(0, 4, steps).tolist()
+    
+    # reset-ul (generarea labirintului) ramane in afara timpului masurat; se masoara doar pasii
+    clock = time.perf_counter
+    elapsed = 0.0
+    start = clock()
+    for action in actions:
+        _, _, done = env.step(action)
+        if done:
+            elapsed += clock() - start
+            env.reset()
+            start = clock()
+    elapsed += clock() - start
+    return metric(steps / elapsed, 'steps/s')
+
+
+def bench_batched_step(size, steps, num_envs=256):
+    env = BatchedMazeEnvironment(num_envs, size, size)
+    actions = np.random.randint(0, 4, (steps, num_envs))
+    
+    start = time.perf_counter()
+    for row in actions:
+        env.step(row)
+    elapsed = time.perf_counter() - start
+    return metric(steps * num_envs / elapsed, 'steps/s')
+
+
+def bench_generate_maze(size, repeat):
+    env = MazeEnvironment(size, size)
+    elapsed = timed(env._generate_simple_maze, repeat)
+    return metric(repeat / elapsed, 'mazes/s')
+
+
+def bench_agent(size, operations):
+    agent = QLearningAgent((size, size), 4)
+    states = [tuple(s) for s in np.random.randint(0, size, (operations + 1, 2)).tolist()]
+    actions = np.random.randint(0, 4, operations).tolist()
+    
+    start = time.perf_counter()
+    for state in states[:-1]:
+        agent.get_action(state)
+    get_action_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    for state, action, next_state in zip(states[:-1], actions, states[1:]):
+        agent.learn(state, action, -0.05, next_state, False)
+    learn_time = time.perf_counter() - start
+    
+    return (metric(operations / get_action_time, 'calls/s'),
+            metric(operations / learn_time, 'calls/s'))
+
+
+def bench_agent_batch(size, operations, batch_size=1024):
+    agent = QLearningAgent((size, size), 4)
+    batches = max(operations // batch_size, 1)
+    states = np.random.randint(0, size, (batches + 1, batch_size, 2))
+    actions = np.random.randint(0, 4, (batches, batch_size))
+    rewards = np.full(batch_size, -0.05)
+    dones = np.zeros(batch_size, dtype=bool)
+    
+    start = time.perf_counter()
+    for batch in states[:-1]:
+        agent.get_actions(batch)
+    get_actions_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    for i in range(batches):
+        agent.learn_batch(states[i], actions[i], rewards, states[i + 1], dones)
+    learn_time = time.perf_counter() - start
+    
+    transitions = batches * batch_size
+    return (metric(transitions / get_actions_time, 'states/s'),
+            metric(transitions / learn_time, 'transitions/s'))
+
+
+def bench_train(size, episodes):
+    trainer = QLearningTrainer()
+    trainer.env = MazeEnvironment(size, size)
+    trainer.agent = QLearningAgent(trainer.env.state_shape, 4)
+    
+    start = time.perf_counter()
+    trainer.train(episodes)
+    elapsed = time.perf_counter() - start
+    
+    steps = int(trainer.training_stats['steps'].sum())
+    return metric(episodes / elapsed, 'episodes/s'), metric(steps / elapsed, 'steps/s')
+
+
+def bench_import_time(repeat=3):
+    code = ("import time; t = time.perf_counter(); "
+            "import q_learning; print(time.perf_counter() - t)")
+    samples = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', code], cwd=ROOT,
+                                capture_output=True, text=True, check=True).stdout
+        samples.append(float(output))
+    return metric(min(samples) * 1000, 'ms', higher_is_better=False)
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+def run_suite(sizes, steps, episodes):
+    results = {}
+    results['import_time'] = bench_import_time()
+    
+    for size in sizes:
+        prefix = f'{size}x{size}'
+        results[f'{prefix}/env_step'] = bench_env_step(size, steps)
+        results[f'{prefix}/env_step_unshaped'] = bench_env_step(size, steps, 'none')
+        results[f'{prefix}/env_step_path'] = bench_env_step(size, steps, 'path')
+        results[f'{prefix}/batched_env_step'] = bench_batched_step(size, max(steps // 256, 10))
+        results[f'{prefix}/generate_maze'] = bench_generate_maze(size, max(steps // max(size, 1), 10))
+        
+        get_action, learn = bench_agent(size, steps)
+        results[f'{prefix}/get_action'] = get_action
+        results[f'{prefix}/learn'] = learn
+        
+        get_actions, learn_batch = bench_agent_batch(size, steps * 10)
+        results[f'{prefix}/get_actions'] = get_actions
+        results[f'{prefix}/learn_batch'] = learn_batch
+        
+        for count in episodes:
+            episodes_per_sec, steps_per_sec = bench_train(size, count)
+            results[f'{prefix}/train_{count}/episodes'] = episodes_per_sec
+            results[f'{prefix}/train_{count}/steps'] = steps_per_sec
+    
+    results['peak_rss'] = metric(peak_rss_mb(), 'MB', higher_is_better=False)
+    return results
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None or not previous['value']:
+            continue
+        
+        change = (current['value'] - previous['value']) / previous['value']
+        if not current['higher_is_better']:
+            change = -change
+        
+        if change < -threshold:
+            regressions.append((name, previous['value'], current['value'], change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark-uri de performanta pentru antrenare')
+    parser.add_argument('--sizes', type=int, nargs='+', default=None,
+                        help='Dimensiunile labirintului (implicit 8 32 128 512)')
+    parser.add_argument('--steps', type=int, default=20000,
+                        help='Numar de operatii pentru micro-benchmark-uri')
+    parser.add_argument('--episodes', type=int, nargs='+', default=[100, 500],
+                        help='Numar de episoade pentru benchmark-urile de antrenare')
+    parser.add_argument('--quick', action='store_true',
+                        help='Rulare rapida pe labirinturi mici')
+    parser.add_argument('--output', metavar='FILE', help='Scrie rezultatele JSON in fisier')
+    parser.add_argument('--compare', metavar='BASELINE', help='Compara cu un fisier de referinta')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='Scaderea relativa tolerata inainte de a raporta o regresie')
+    args = parser.parse_args()
+    
+    sizes = args.sizes or (QUICK_SIZES if args.quick else DEFAULT_SIZES)
+    steps = min(args.steps, 2000) if args.quick else args.steps
+    episodes = [min(count, 100) for count in args.episodes] if args.quick else args.episodes
+    
+    report = {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'results': run_suite(sizes, steps, episodes),
+    }
+    
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+    
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+        
+        regressions = compare(report['results'], baseline, args.threshold)
+        for name, previous, current, change in regressions:
+            print(f"REGRESIE {name}: {previous:.1f} -> {current:.1f} ({change * 100:+.1f}%)", file=sys.stderr)
+        
+        if regressions:
+            sys.exit(1)
+        print("Nicio regresie fata de referinta.", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,197 @@
+import json
+import os
+import shutil
+import numpy as np
+from agent import QLearningAgent, SparseQTable
+from config import Config, DEFAULT_CONFIG
+
+CHECKPOINT_VERSION = 2
+CHECKPOINT_VERSIONS = (1, 2)
+
+META_FILE = 'meta.json'
+Q_TABLE_FILE = 'q_table.npy'
+HISTORY_FILE = 'history.npz'
+KEYS_FILE = 'keys.npy'
+GENERATION_PREFIX = 'gen-'
+
+
+def _replace_atomic(path, write):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        write(f)
+    os.replace(tmp_path, path)
+
+
+def _table_values(agent):
+    if agent.q_backend == 'sparse':
+        return agent.q_table.to_arrays()[1]
+    return agent.q_table
+
+
+def _generation_dir(path, generation):
+    return os.path.join(path, f"{GENERATION_PREFIX}{generation:06d}")
+
+
+def _read_meta(path):
+    with open(os.path.join(path, META_FILE), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _next_generation(path):
+    try:
+        return _read_meta(path).get('generation', 0) + 1
+    except (OSError, ValueError):
+        return 1
+
+
+def _remove_old_generations(path, keep):
+    for name in os.listdir(path):
+        if not name.startswith(GENERATION_PREFIX):
+            continue
+        suffix = name[len(GENERATION_PREFIX):]
+        # generatia anterioara ramane pentru cititorii care au citit deja meta.json-ul vechi
+        if suffix.isdigit() and int(suffix) < keep - 1:
+            shutil.rmtree(os.path.join(path, name), ignore_errors=True)
+
+
+def save_checkpoint(agent, path, episode=None):
+    os.makedirs(path, exist_ok=True)
+    generation = _next_generation(path)
+    
+    # fisierele de date se scriu intr-un director temporar redenumit la final in gen-NNNNNN;
+    # meta.json indica generatia completa, deci un cititor nu amesteca fisiere din salvari diferite
+    data_path = _generation_dir(path, generation)
+    tmp_path = data_path + '.tmp'
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+    
+    if agent.q_backend == 'sparse':
+        keys, values = agent.q_table.to_arrays()
+        np.save(os.path.join(tmp_path, KEYS_FILE), keys)
+    else:
+        values = agent.q_table
+    np.save(os.path.join(tmp_path, Q_TABLE_FILE), np.ascontiguousarray(values))
+    
+    np.savez(
+        os.path.join(tmp_path, HISTORY_FILE),
+        episode_rewards=np.asarray(agent.episode_rewards, dtype=np.float64),
+        episode_steps=np.asarray(agent.episode_steps, dtype=np.int64),
+        exploration_rates=np.asarray(agent.exploration_rates, dtype=np.float64),
+    )
+    shutil.rmtree(data_path, ignore_errors=True)
+    os.rename(tmp_path, data_path)
+    
+    meta = {
+        'version': CHECKPOINT_VERSION,
+        'generation': generation,
+        'episode': episode,
+        'state_space_size': list(agent.state_space_size),
+        'action_space_size': agent.action_space_size,
+        'q_backend': agent.q_backend,
+        'learning_rate': agent.learning_rate,
+        'discount_factor': agent.discount_factor,
+        'exploration_rate': agent.exploration_rate,
+        'exploration_decay': agent.exploration_decay,
+        'min_exploration_rate': agent.min_exploration_rate,
+        'learning_mode': agent.learning_mode,
+        'n_step': agent.n_step,
+        'trace_lambda': agent.trace_lambda,
+    }
+    # meta.json se inlocuieste ultimul si atomic: pana atunci cititorii vad generatia anterioara
+    _replace_atomic(os.path.join(path, META_FILE),
+                    lambda f: f.write(json.dumps(meta, indent=2).encode('utf-8')))
+    
+    # fisierele checkpoint-urilor in format vechi (direct in director) sunt inlocuite de generatie
+    for name in (KEYS_FILE, Q_TABLE_FILE, HISTORY_FILE):
+        old_file = os.path.join(path, name)
+        if os.path.exists(old_file):
+            os.remove(old_file)
+    _remove_old_generations(path, generation)
+
+
+def read_checkpoint_meta(path):
+    meta = _read_meta(path)
+    if meta.get('version') not in CHECKPOINT_VERSIONS:
+        raise ValueError(f"Versiune checkpoint nesuportata: {meta.get('version')}")
+    return meta
+
+
+def load_checkpoint(path, mmap=False, rng=None, config=DEFAULT_CONFIG):
+    meta = read_checkpoint_meta(path)
+    
+    if meta['version'] >= 2:
+        data_path = _generation_dir(path, meta['generation'])
+        if not os.path.isdir(data_path):
+            # meta.json a fost inlocuit de o salvare mai noua intre timp; se reincearca
+            raise ValueError(f"Generatia {meta['generation']} lipseste din checkpoint")
+    else:
+        data_path = path
+    
+    state_space_size = tuple(meta['state_space_size'])
+    q_backend = meta.get('q_backend', 'dense')
+    agent = QLearningAgent(state_space_size, meta['action_space_size'], q_backend, rng=rng, config=config)
+    
+    values = np.load(os.path.join(data_path, Q_TABLE_FILE), mmap_mode='r' if mmap else None)
+    if q_backend == 'sparse':
+        keys = np.load(os.path.join(data_path, KEYS_FILE))
+        agent.q_table = SparseQTable.from_arrays(state_space_size, keys, values, rng=agent.rng)
+    else:
+        agent.q_table = values
+    
+    agent.learning_rate = meta['learning_rate']
+    agent.discount_factor = meta['discount_factor']
+    agent.exploration_rate = meta['exploration_rate']
+    agent.exploration_decay = meta['exploration_decay']
+    agent.min_exploration_rate = meta['min_exploration_rate']
+    agent.set_learning_mode(meta.get('learning_mode', 'q'), meta.get('n_step'), meta.get('trace_lambda'))
+    
+    with np.load(os.path.join(data_path, HISTORY_FILE)) as history:
+        agent.history.extend(
+            reward=history['episode_rewards'],
+            steps=history['episode_steps'],
+            exploration=history['exploration_rates'],
+        )
+    
+    return agent
+
+
+class CheckpointWriter:
+    def __init__(self, agent, path, every=Config.CHECKPOINT_EVERY, min_change=Config.CHECKPOINT_MIN_CHANGE):
+        self.agent = agent
+        self.path = path
+        self.every = every
+        self.min_change = min_change
+        
+        self.saved_q_table = None
+        self.saved_episode = None
+        self.saves = 0
+        self.skipped = 0
+    
+    def changed_enough(self):
+        if self.saved_q_table is None:
+            return True
+        
+        values = _table_values(self.agent)
+        if values.shape != self.saved_q_table.shape:
+            return True
+        return np.max(np.abs(values - self.saved_q_table)) >= self.min_change
+    
+    def save(self, episode=None):
+        save_checkpoint(self.agent, self.path, episode)
+        self.saved_q_table = np.array(_table_values(self.agent), copy=True)
+        self.saved_episode = episode
+        self.saves += 1
+    
+    def maybe_save(self, episode, force=False):
+        if not force and (self.every <= 0 or (episode + 1) % self.every != 0):
+            return False
+        
+        # apelul fortat de la final, imediat dupa o salvare periodica a aceluiasi episod, nu este o sarire
+        if episode == self.saved_episode:
+            return False
+        if not self.changed_enough():
+            self.skipped += 1
+            return False
+        
+        self.save(episode)
+        return True
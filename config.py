@@ -1,26 +1,57 @@
+import ast
+import json
+
+
 class Config:
     MAZE_WIDTH = 8  
     MAZE_HEIGHT = 8  
     WALL_DENSITY = 0.2
+    MAZE_POOL_SIZE = 0
     
     LEARNING_RATE = 0.6     
     DISCOUNT_FACTOR = 0.9
     EXPLORATION_RATE = 0.3
     EXPLORATION_DECAY = 0.995
     MIN_EXPLORATION_RATE = 0.05  
+    Q_TABLE_BACKEND = 'dense'
+    LEARNING_MODE = 'q'
+    N_STEP = 3
+    TRACE_LAMBDA = 0.8
+    TRACE_THRESHOLD = 1e-3
 
     EPISODES = 500
     MAX_STEPS_PER_EPISODE = 50
+    CONVERGENCE_TOLERANCE = 0.0
+    CONVERGENCE_PATIENCE = 100
+    
+    SYNC_INTERVAL = 50
+    
+    REPLAY_CAPACITY = 50000
+    REPLAY_BATCH_SIZE = 64
+    REPLAY_RATIO = 4
+    PRIORITY_ALPHA = 0.6
+    PRIORITY_BETA = 0.4
+    
+    PLANNING_STEPS = 0
+    PLANNING_BATCH_SIZE = 64
+    PLANNING_BETWEEN_EPISODES = False
+    
+    STATS_RING_SIZE = 0
+    SNAPSHOT_EVERY = 10
+    PROFILE_SAMPLE_EVERY = 10
+    
+    CHECKPOINT_EVERY = 100
+    CHECKPOINT_MIN_CHANGE = 1e-3
     
     REWARD_CATCH = 100
     REWARD_STEP = -0.05          
     REWARD_WALL = -2             
     REWARD_CLOSER = 3
+    REWARD_SHAPING = 'none'
     
     CELL_SIZE = 75  
     FPS = 30
-    SCREEN_WIDTH = MAZE_WIDTH * CELL_SIZE  
-    SCREEN_HEIGHT = MAZE_HEIGHT * CELL_SIZE + 180  
+    PANEL_HEIGHT = 180
     
     BACKGROUND = (240, 240, 240)
     WALL = (70, 70, 70)
@@ -32,4 +63,91 @@ class Config:
     GRID = (200, 200, 200)
     PANEL = (220, 220, 220)
     BUTTON = (100, 150, 255)
-    BUTTON_HOVER = (120, 170, 255)
\ No newline at end of file
+    BUTTON_HOVER = (120, 170, 255)
+    
+    def __init__(self, **overrides):
+        values = {name: value for name, value in vars(Config).items() if name.isupper()}
+        for name, value in overrides.items():
+            if name not in values:
+                raise AttributeError(f"Parametru de configurare necunoscut: {name}")
+            if isinstance(values[name], tuple):
+                value = tuple(value)
+            values[name] = value
+        # valorile sunt copiate in instanta: o configuratie nu se mai schimba dupa construire
+        self.__dict__.update(values)
+        self.__dict__['_overrides'] = dict(overrides)
+    
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Configuratia este imuabila; folositi replace({name}=...)")
+    
+    def __delattr__(self, name):
+        raise AttributeError("Configuratia este imuabila")
+    
+    def __repr__(self):
+        args = ', '.join(f"{name}={value!r}" for name, value in self._overrides.items())
+        return f"Config({args})"
+    
+    def __eq__(self, other):
+        return isinstance(other, Config) and self.to_dict() == other.to_dict()
+    
+    def __hash__(self):
+        return hash(tuple(sorted(self.to_dict().items())))
+    
+    def overrides(self):
+        return dict(self._overrides)
+    
+    def to_dict(self):
+        return {name: value for name, value in self.__dict__.items() if name.isupper()}
+    
+    def replace(self, **overrides):
+        return Config(**{**self._overrides, **overrides})
+    
+    @classmethod
+    def from_file(cls, path, **overrides):
+        with open(path, encoding='utf-8') as f:
+            values = json.load(f)
+        return cls(**{**{name.upper(): value for name, value in values.items()}, **overrides})
+    
+    @classmethod
+    def from_assignments(cls, assignments, base=None):
+        overrides = {}
+        for assignment in assignments:
+            name, separator, value = assignment.partition('=')
+            if not separator:
+                raise ValueError(f"Se astepta NUME=VALOARE, nu {assignment!r}")
+            name = name.strip().upper()
+            overrides[name] = parse_value(value.strip(), name)
+        return (base or DEFAULT_CONFIG).replace(**overrides)
+    
+    def save(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+
+def parse_value(text, name=None):
+    try:
+        value = ast.literal_eval(text)
+    except (ValueError, SyntaxError):
+        value = text
+    
+    # valoarea primeste tipul valorii implicite a parametrului (bool, numar, tuplu sau text)
+    default = getattr(Config, name, None) if name else None
+    if default is None:
+        return value
+    if isinstance(default, bool):
+        if isinstance(value, bool) or value in (0, 1):
+            return bool(value)
+        if isinstance(value, str) and value.lower() in ('true', 'false'):
+            return value.lower() == 'true'
+    elif isinstance(default, (int, float)):
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return float(value) if isinstance(default, float) else value
+    elif isinstance(default, tuple):
+        if isinstance(value, (tuple, list)) and len(value) == len(default):
+            return tuple(value)
+    elif isinstance(default, str):
+        return value if isinstance(value, str) else text
+    raise ValueError(f"Valoare invalida pentru {name}: {text!r} (implicit {default!r})")
+
+
+DEFAULT_CONFIG = Config()
@@ -1,15 +1,182 @@
 import numpy as np
-import random
-from config import Config
+from collections import OrderedDict, deque
+from config import Config, DEFAULT_CONFIG
+from rng import make_rng, RandomStream
+
+MOVE_OFFSETS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+MOVES = np.array(MOVE_OFFSETS)
+MOUSE_MOVES = np.array([(0, 1), (0, -1), (1, 0), (-1, 0)])
+REWARD_SHAPINGS = ('none', 'manhattan', 'path')
+
+
+def generate_mazes(count, height, width, rng=None):
+    rng = make_rng(rng)
+    border = np.zeros((height, width), dtype=bool)
+    border[[0, -1], :] = True
+    border[:, [0, -1]] = True
+    wall_probability = np.where(border, 0.6, 0.08)
+    
+    mazes = (rng.random((count, height, width)) < wall_probability).astype(np.int8)
+    mazes[:, 1, 1] = 0
+    mazes[:, height-2, width-2] = 0
+    
+    neighbors = (mazes[:, :-2, 1:-1] + mazes[:, 2:, 1:-1] +
+                 mazes[:, 1:-1, :-2] + mazes[:, 1:-1, 2:])
+    inner = mazes[:, 1:-1, 1:-1]
+    inner[neighbors >= 3] = 0
+    return mazes
+
+
+class DistanceStateEncoder:
+    def state_shape(self, height, width):
+        return (height, width)
+    
+    def encode(self, env):
+        return (abs(env.cat_pos[0] - env.mouse_pos[0]), abs(env.cat_pos[1] - env.mouse_pos[1]))
+    
+    def encode_batch(self, env):
+        return np.abs(env.cat_pos - env.mouse_pos)
+
+
+class PositionStateEncoder:
+    def state_shape(self, height, width):
+        return (height, width, height, width)
+    
+    def encode(self, env):
+        return (env.cat_pos[0], env.cat_pos[1], env.mouse_pos[0], env.mouse_pos[1])
+    
+    def encode_batch(self, env):
+        return np.concatenate((env.cat_pos, env.mouse_pos), axis=1)
+
+
+class LocalViewStateEncoder:
+    def state_shape(self, height, width):
+        return (height, width, 3, 3, 16)
+    
+    def encode(self, env):
+        y, x = env.cat_pos
+        mouse_y, mouse_x = env.mouse_pos
+        
+        wall_mask = 0
+        for bit, (dy, dx) in enumerate(MOVE_OFFSETS):
+            ny, nx = y + dy, x + dx
+            if not (0 <= ny < env.height and 0 <= nx < env.width) or env.maze[ny][nx] == 1:
+                wall_mask |= 1 << bit
+        
+        return (abs(y - mouse_y), abs(x - mouse_x),
+                (mouse_y > y) - (mouse_y < y) + 1, (mouse_x > x) - (mouse_x < x) + 1,
+                wall_mask)
+    
+    def encode_batch(self, env):
+        delta = env.mouse_pos - env.cat_pos
+        rows = np.arange(env.num_envs)
+        
+        wall_mask = np.zeros(env.num_envs, dtype=np.intp)
+        for bit, move in enumerate(MOVES):
+            neighbor = env.cat_pos + move
+            ny, nx = neighbor[:, 0], neighbor[:, 1]
+            outside = (ny < 0) | (ny >= env.height) | (nx < 0) | (nx >= env.width)
+            blocked = env.mazes[rows, np.clip(ny, 0, env.height - 1), np.clip(nx, 0, env.width - 1)] == 1
+            wall_mask |= (outside | blocked).astype(np.intp) << bit
+        
+        return np.column_stack((np.abs(delta), np.sign(delta) + 1, wall_mask))
+
+
+class MazePool:
+    def __init__(self, capacity=256, width=Config.MAZE_WIDTH, height=Config.MAZE_HEIGHT,
+                 mode='sample', refresh_every=0, rng=None):
+        if mode not in ('sample', 'cycle'):
+            raise ValueError(f"Mod necunoscut pentru MazePool: {mode}")
+        
+        self.capacity = capacity
+        self.width = width
+        self.height = height
+        self.mode = mode
+        self.refresh_every = refresh_every
+        self.rng = make_rng(rng)
+        
+        # fiecare intrare este un tablou propriu, doar pentru citire: o intrare inlocuita de refresh/add
+        # nu modifica labirintul unui mediu care il foloseste deja
+        self.mazes = [self._freeze(maze) for maze in generate_mazes(capacity, height, width, self.rng)]
+        # tabelele de tranzitii si distantele BFS ale unei intrari se construiesc o singura data
+        self.tables = [{} for _ in range(capacity)]
+        self._lru = OrderedDict.fromkeys(range(capacity))
+        self._cursor = 0
+        self._gets = 0
+    
+    def __len__(self):
+        return self.capacity
+    
+    @staticmethod
+    def _freeze(maze):
+        maze = np.array(maze, dtype=np.int8)
+        maze.flags.writeable = False
+        return maze
+    
+    def _next_index(self):
+        if self.mode == 'cycle':
+            idx = self._cursor
+            self._cursor = (self._cursor + 1) % self.capacity
+            return idx
+        return int(self.rng.integers(self.capacity))
+    
+    def get_entry(self):
+        self._gets += 1
+        if self.refresh_every and self._gets % self.refresh_every == 0:
+            self.refresh(1)
+        
+        idx = self._next_index()
+        self._lru.move_to_end(idx)
+        return self.mazes[idx], self.tables[idx]
+    
+    def get(self):
+        return self.get_entry()[0]
+    
+    def sample(self, count):
+        return np.stack([self.get() for _ in range(count)])
+    
+    def add(self, maze):
+        idx = next(iter(self._lru))
+        self.mazes[idx] = self._freeze(maze)
+        self.tables[idx] = {}
+        self._lru.move_to_end(idx)
+        return idx
+    
+    def refresh(self, count):
+        for maze in generate_mazes(count, self.height, self.width, self.rng):
+            self.add(maze)
+
 
 class MazeEnvironment:
-    def __init__(self, width=Config.MAZE_WIDTH, height=Config.MAZE_HEIGHT):
+    def __init__(self, width=None, height=None, maze_pool=None, state_encoder=None,
+                 reward_shaping=None, rng=None, config=DEFAULT_CONFIG):
+        width = width or config.MAZE_WIDTH
+        height = height or config.MAZE_HEIGHT
+        reward_shaping = reward_shaping or config.REWARD_SHAPING
+        if reward_shaping not in REWARD_SHAPINGS:
+            raise ValueError(f"Mod necunoscut de modelare a recompensei: {reward_shaping}")
+        
+        self.config = config
+        self.reward_catch = config.REWARD_CATCH
+        self.reward_step = config.REWARD_STEP
+        self.reward_wall = config.REWARD_WALL
+        self.reward_closer = config.REWARD_CLOSER
+        self.max_steps = config.MAX_STEPS_PER_EPISODE
+        self.rng = make_rng(rng)
+        self.random = RandomStream(self.rng)
         self.width = width
         self.height = height
+        self.maze_pool = maze_pool
+        self.state_encoder = state_encoder or DistanceStateEncoder()
+        self.state_shape = self.state_encoder.state_shape(height, width)
+        self.reward_shaping = reward_shaping
         self.reset()
         
     def reset(self):
-        self.maze = self._generate_simple_maze()
+        if self.maze_pool is not None:
+            self.maze, tables = self.maze_pool.get_entry()
+        else:
+            self.maze, tables = self._generate_simple_maze(), {}
         
         self.cat_pos = self._get_start_position()
         self.mouse_pos = self._get_goal_position()
@@ -22,34 +189,60 @@ class MazeEnvironment:
         self.done = False
         self.total_reward = 0
         
+        if not tables:
+            self._build_tables(tables)
+        self._tables = tables
+        self.neighbors = tables['neighbors']
+        self.transitions = tables['transitions']
+        self._mouse_options = tables['mouse_options']
+        self._path_distances = tables['path_distances']
+        self._cat_cell = self.cat_pos[0] * self.width + self.cat_pos[1]
+        self._mouse_cell = self.mouse_pos[0] * self.width + self.mouse_pos[1]
+        
         return self._get_state()
     
+    def _build_tables(self, tables):
+        cells = np.arange(self.height * self.width)
+        ys, xs = np.divmod(cells, self.width)
+        free = self.maze.reshape(-1) == 0
+        
+        target_y = ys[:, None] + MOVES[:, 0]
+        target_x = xs[:, None] + MOVES[:, 1]
+        in_bounds = (target_y >= 0) & (target_y < self.height) & (target_x >= 0) & (target_x < self.width)
+        targets = np.clip(target_y, 0, self.height - 1) * self.width + np.clip(target_x, 0, self.width - 1)
+        
+        # vecinii liberi (mouse, BFS); -1 = zid sau in afara labirintului
+        tables['neighbors'] = np.where(in_bounds & free[targets], targets, -1)
+        # tranzitiile pisicii: iesirea din labirint o lasa pe loc, zidul este marcat cu -1
+        tables['transitions'] = np.where(free[targets], targets, -1)
+        
+        tables['mouse_options'] = {}
+        tables['path_distances'] = {}
+        tables['neighbor_lists'] = None
+    
+    def distances_to(self, cell):
+        distances = self._path_distances.get(cell)
+        if distances is None:
+            neighbor_lists = self._tables['neighbor_lists']
+            if neighbor_lists is None:
+                neighbor_lists = [[t for t in row if t >= 0] for row in self.neighbors.tolist()]
+                self._tables['neighbor_lists'] = neighbor_lists
+            
+            distances = [-1] * (self.height * self.width)
+            distances[cell] = 0
+            queue = deque([cell])
+            while queue:
+                current = queue.popleft()
+                depth = distances[current] + 1
+                for neighbor in neighbor_lists[current]:
+                    if distances[neighbor] < 0:
+                        distances[neighbor] = depth
+                        queue.append(neighbor)
+            self._path_distances[cell] = distances
+        return distances
+    
     def _generate_simple_maze(self):
-        maze = np.zeros((self.height, self.width), dtype=int)
-        
-        for i in range(self.height):
-            for j in range(self.width):
-                if (i == 0 or i == self.height-1 or 
-                    j == 0 or j == self.width-1):
-                    if random.random() < 0.6:  
-                        maze[i][j] = 1
-                else:
-                    if random.random() < 0.08: 
-                        maze[i][j] = 1
-        
-        maze[1][1] = 0  
-        maze[self.height-2][self.width-2] = 0  
-        
-        for i in range(1, self.height-1):
-            for j in range(1, self.width-1):
-                if maze[i][j] == 1:
-                    neighbors = [
-                        maze[i-1][j], maze[i+1][j],
-                        maze[i][j-1], maze[i][j+1]
-                    ]
-                    if sum(neighbors) >= 3:  
-                        maze[i][j] = 0  
-        return maze
+        return generate_mazes(1, self.height, self.width, self.rng)[0]
     
     def _get_start_position(self):
         return (1, 1)  
@@ -58,38 +251,45 @@ class MazeEnvironment:
         return (self.height-2, self.width-2)  
     
     def _get_state(self):
-        dy = abs(self.cat_pos[0] - self.mouse_pos[0])
-        dx = abs(self.cat_pos[1] - self.mouse_pos[1])
-        return (dy, dx)
+        return self.state_encoder.encode(self)
+    
+    def _distance(self, cell):
+        if self.reward_shaping == 'path':
+            return self.distances_to(self._mouse_cell)[cell]
+        return self._manhattan_distance(divmod(cell, self.width), self.mouse_pos)
     
     def step(self, action):
         self.steps += 1
         
-        new_cat_pos = self._move_agent(self.cat_pos, action)
+        cell = self._cat_cell
+        new_cell = int(self.transitions[cell, action])
         
-        if self._is_wall(new_cat_pos):
-            reward = Config.REWARD_WALL
-            new_cat_pos = self.cat_pos 
+        if new_cell < 0:
+            reward = self.reward_wall
         else:
-            self.cat_pos = new_cat_pos
-            reward = Config.REWARD_STEP
+            reward = self.reward_step
             
-            old_distance = self._manhattan_distance(self.cat_pos, self.mouse_pos)
-            new_distance = self._manhattan_distance(new_cat_pos, self.mouse_pos)
+            if self.reward_shaping != 'none' and new_cell != cell:
+                old_distance = self._distance(cell)
+                new_distance = self._distance(new_cell)
+                
+                if old_distance >= 0 and new_distance >= 0:
+                    if new_distance < old_distance:
+                        reward += self.reward_closer * (old_distance - new_distance)  
+                    elif new_distance > old_distance:
+                        reward -= self.reward_closer * 0.5  
             
-            if new_distance < old_distance:
-                reward += Config.REWARD_CLOSER * (old_distance - new_distance)  
-            elif new_distance > old_distance:
-                reward -= Config.REWARD_CLOSER * 0.5  
+            self._cat_cell = new_cell
+            self.cat_pos = divmod(new_cell, self.width)
         
-        if random.random() < 0.3:  
+        if self.random.random() < 0.3:  
             self._move_mouse_simple()
         
-        if self.cat_pos == self.mouse_pos:
-            reward = Config.REWARD_CATCH
+        if self._cat_cell == self._mouse_cell:
+            reward = self.reward_catch
             self.done = True
         
-        if self.steps >= Config.MAX_STEPS_PER_EPISODE:
+        if self.steps >= self.max_steps:
             self.done = True
             
         self.total_reward += reward
@@ -97,44 +297,143 @@ class MazeEnvironment:
         
         return next_state, reward, self.done
     
-    def _move_agent(self, pos, action):
-        y, x = pos
-        
-        if action == 0:  
-            y = max(0, y - 1)
-        elif action == 1:  
-            y = min(self.height - 1, y + 1)
-        elif action == 2:  
-            x = max(0, x - 1)
-        elif action == 3:  
-            x = min(self.width - 1, x + 1)
-            
-        return (y, x)
-    
     def _move_mouse_simple(self):
-        current_y, current_x = self.mouse_pos
-        
-        possible_moves = []
-        
-        directions = [(0, 1), (0, -1), (1, 0), (-1, 0)]
-        random.shuffle(directions)  
+        cell = self._mouse_cell
+        options = self._mouse_options.get(cell)
+        if options is None:
+            options = [int(target) for target in self.neighbors[cell] if target >= 0]
+            self._mouse_options[cell] = options
         
-        for dy, dx in directions:
-            new_y = current_y + dy
-            new_x = current_x + dx
-            
-            if (0 <= new_y < self.height and 
-                0 <= new_x < self.width and 
-                self.maze[new_y][new_x] == 0):
-                possible_moves.append((new_y, new_x))
-                break  
-        
-        if possible_moves:
-            self.mouse_pos = possible_moves[0]
+        # prima directie libera dintr-o ordine amestecata = alegere uniforma intre directiile libere
+        if options:
+            self._mouse_cell = self.random.choice(options)
+            self.mouse_pos = divmod(self._mouse_cell, self.width)
     
     def _is_wall(self, pos):
         y, x = pos
         return self.maze[y][x] == 1
     
     def _manhattan_distance(self, pos1, pos2):
-        return abs(pos1[0] - pos2[0]) + abs(pos1[1] - pos2[1])
\ No newline at end of file
+        return abs(pos1[0] - pos2[0]) + abs(pos1[1] - pos2[1])
+
+
+class BatchedMazeEnvironment:
+    def __init__(self, num_envs, width=None, height=None, maze_pool=None,
+                 state_encoder=None, reward_shaping=None, rng=None, config=DEFAULT_CONFIG):
+        width = width or config.MAZE_WIDTH
+        height = height or config.MAZE_HEIGHT
+        reward_shaping = reward_shaping or config.REWARD_SHAPING
+        if reward_shaping not in ('none', 'manhattan'):
+            raise ValueError(f"Mod de modelare a recompensei nesuportat in BatchedMazeEnvironment: {reward_shaping}")
+        
+        self.num_envs = num_envs
+        self.config = config
+        self.reward_catch = config.REWARD_CATCH
+        self.reward_step = config.REWARD_STEP
+        self.reward_wall = config.REWARD_WALL
+        self.reward_closer = config.REWARD_CLOSER
+        self.max_steps = config.MAX_STEPS_PER_EPISODE
+        self.reward_shaping = reward_shaping
+        self.rng = make_rng(rng)
+        self.width = width
+        self.height = height
+        self.maze_pool = maze_pool
+        self.state_encoder = state_encoder or DistanceStateEncoder()
+        self.state_shape = self.state_encoder.state_shape(height, width)
+        
+        self.mazes = np.zeros((num_envs, height, width), dtype=np.int8)
+        self.cat_pos = np.zeros((num_envs, 2), dtype=np.intp)
+        self.mouse_pos = np.zeros((num_envs, 2), dtype=np.intp)
+        self.steps = np.zeros(num_envs, dtype=np.int32)
+        self.total_rewards = np.zeros(num_envs)
+        
+        self.final_rewards = np.zeros(num_envs)
+        self.final_steps = np.zeros(num_envs, dtype=np.int32)
+        self.final_success = np.zeros(num_envs, dtype=bool)
+        
+        self._rows = np.arange(num_envs)
+        self.reset()
+    
+    def reset(self, mask=None, mazes=None):
+        idx = self._rows if mask is None else np.flatnonzero(mask)
+        
+        if idx.size:
+            if mazes is not None:
+                self.mazes[idx] = mazes
+            elif self.maze_pool is not None:
+                self.mazes[idx] = self.maze_pool.sample(idx.size)
+            else:
+                self.mazes[idx] = generate_mazes(idx.size, self.height, self.width, self.rng)
+            self.cat_pos[idx] = (1, 1)
+            self.mouse_pos[idx] = (self.height-2, self.width-2)
+            self.steps[idx] = 0
+            self.total_rewards[idx] = 0
+        
+        self.states = self._get_states()
+        return self.states
+    
+    def _get_states(self):
+        return self.state_encoder.encode_batch(self)
+    
+    def step(self, actions, auto_reset=True):
+        self.steps += 1
+        
+        new_cat_pos = self.cat_pos + MOVES[actions]
+        np.clip(new_cat_pos[:, 0], 0, self.height - 1, out=new_cat_pos[:, 0])
+        np.clip(new_cat_pos[:, 1], 0, self.width - 1, out=new_cat_pos[:, 1])
+        
+        hit_wall = self.mazes[self._rows, new_cat_pos[:, 0], new_cat_pos[:, 1]] == 1
+        rewards = np.where(hit_wall, float(self.reward_wall), float(self.reward_step))
+        
+        if self.reward_shaping == 'manhattan':
+            old_distance = np.abs(self.cat_pos - self.mouse_pos).sum(axis=1)
+            new_distance = np.abs(new_cat_pos - self.mouse_pos).sum(axis=1)
+            shaping = np.where(new_distance < old_distance, self.reward_closer * (old_distance - new_distance), 0.0)
+            shaping[new_distance > old_distance] = -self.reward_closer * 0.5
+            rewards += np.where(hit_wall, 0.0, shaping)
+        
+        self.cat_pos = np.where(hit_wall[:, None], self.cat_pos, new_cat_pos)
+        
+        mouse_moves = np.flatnonzero(self.rng.random(self.num_envs) < 0.3)
+        if mouse_moves.size:
+            self._move_mice(mouse_moves)
+        
+        caught = (self.cat_pos == self.mouse_pos).all(axis=1)
+        rewards[caught] = self.reward_catch
+        dones = caught | (self.steps >= self.max_steps)
+        
+        self.total_rewards += rewards
+        next_states = self._get_states()
+        
+        any_done = dones.any()
+        if any_done:
+            self.final_rewards[dones] = self.total_rewards[dones]
+            self.final_steps[dones] = self.steps[dones]
+            self.final_success[dones] = caught[dones]
+        
+        # fara auto_reset, sloturile terminate continua sa avanseze; apelantul le ignora
+        if auto_reset and any_done:
+            self.reset(dones)
+        else:
+            self.states = next_states
+        
+        return next_states, rewards, dones
+    
+    def _move_mice(self, idx):
+        candidates = self.mouse_pos[idx, None, :] + MOUSE_MOVES
+        cand_y = candidates[..., 0]
+        cand_x = candidates[..., 1]
+        
+        in_bounds = (cand_y >= 0) & (cand_y < self.height) & (cand_x >= 0) & (cand_x < self.width)
+        cells = self.mazes[idx[:, None],
+                           np.clip(cand_y, 0, self.height - 1),
+                           np.clip(cand_x, 0, self.width - 1)]
+        free = in_bounds & (cells == 0)
+        
+        # prima directie libera dintr-o ordine aleatoare, ca in _move_mouse_simple
+        order = self.rng.random(free.shape)
+        order[~free] = 2.0
+        choice = order.argmin(axis=1)
+        
+        can_move = free.any(axis=1)
+        self.mouse_pos[idx[can_move]] = candidates[can_move, choice[can_move]]
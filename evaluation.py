@@ -0,0 +1,129 @@
+import time
+import numpy as np
+from config import DEFAULT_CONFIG
+from environment import BatchedMazeEnvironment, DistanceStateEncoder, generate_mazes
+from rng import make_rng
+
+BATCHED_REWARD_SHAPINGS = ('none', 'manhattan')
+
+
+class PolicyEvaluator:
+    def __init__(self, agent, state_encoder=None, reward_shaping=None, batch_size=16384, rng=None,
+                 config=DEFAULT_CONFIG):
+        reward_shaping = reward_shaping or config.REWARD_SHAPING
+        # modelarea pe drumul cel mai scurt nu exista in mediul vectorizat; o alta modelare ar schimba
+        # recompensa medie fata de antrenare
+        if reward_shaping not in BATCHED_REWARD_SHAPINGS:
+            raise ValueError(f"Evaluarea vectorizata nu suporta modelarea recompensei '{reward_shaping}' "
+                             f"(doar {', '.join(BATCHED_REWARD_SHAPINGS)})")
+        self.agent = agent
+        self.config = config
+        self.state_encoder = state_encoder or DistanceStateEncoder()
+        self.reward_shaping = reward_shaping
+        self.batch_size = batch_size
+        self.rng = make_rng(rng)
+        self.width = config.MAZE_WIDTH
+        self.height = config.MAZE_HEIGHT
+    
+    def greedy_policy(self):
+        # instantaneu al politicii: evaluarea nu atinge tabela Q (nici starile noi ale tabelei rare)
+        policy = self.agent.get_best_policy().copy()
+        policy[policy < 0] = 0
+        return policy
+    
+    def _make_env(self, num_envs):
+        return BatchedMazeEnvironment(num_envs, self.width, self.height, state_encoder=self.state_encoder,
+                                      reward_shaping=self.reward_shaping, rng=self.rng, config=self.config)
+    
+    def _run_batch(self, env, policy, mazes, step_times):
+        count = len(mazes)
+        env.reset(mazes=mazes)
+        states = env.states
+        
+        active = np.ones(count, dtype=bool)
+        rewards = np.zeros(count)
+        steps = np.zeros(count, dtype=np.int32)
+        success = np.zeros(count, dtype=bool)
+        
+        while active.any():
+            start = time.perf_counter()
+            actions = policy[tuple(np.asarray(states).T)]
+            states, step_rewards, dones = env.step(actions, auto_reset=False)
+            step_times.append(time.perf_counter() - start)
+            
+            rewards[active] += step_rewards[active]
+            finished = active & dones
+            steps[finished] = env.steps[finished]
+            success[finished] = env.final_success[finished]
+            active &= ~dones
+        
+        return rewards, steps, success
+    
+    def evaluate(self, episodes=1000, mazes=None):
+        if mazes is not None:
+            mazes = np.asarray(mazes, dtype=np.int8)
+            if mazes.ndim != 3:
+                raise ValueError(f"Labirinturile trebuie sa aiba forma (N, inaltime, latime), nu {mazes.shape}")
+            # starile din labirinturile date trebuie sa incapa in tabela Q antrenata
+            state_shape = self.state_encoder.state_shape(*mazes.shape[1:])
+            if any(size > limit for size, limit in zip(state_shape, self.agent.state_space_size)):
+                raise ValueError(f"Labirinturi {mazes.shape[1]}x{mazes.shape[2]}: starile {state_shape} nu incap "
+                                 f"in tabela Q antrenata {self.agent.state_space_size}")
+            episodes = len(mazes)
+            self.height, self.width = mazes.shape[1:]
+        
+        start_time = time.perf_counter()
+        policy = self.greedy_policy()
+        rewards = np.zeros(episodes)
+        steps = np.zeros(episodes, dtype=np.int32)
+        success = np.zeros(episodes, dtype=bool)
+        step_times = []
+        
+        env = None
+        for begin in range(0, episodes, self.batch_size):
+            end = min(begin + self.batch_size, episodes)
+            if env is None or env.num_envs != end - begin:
+                env = self._make_env(end - begin)
+            
+            if mazes is not None:
+                batch = mazes[begin:end]
+            else:
+                batch = generate_mazes(end - begin, self.height, self.width, self.rng)
+            rewards[begin:end], steps[begin:end], success[begin:end] = self._run_batch(env, policy, batch, step_times)
+        
+        seconds = time.perf_counter() - start_time
+        return evaluation_report(rewards, steps, success, np.array(step_times), seconds)
+
+
+def evaluation_report(rewards, steps, success, step_times, seconds):
+    episodes = len(rewards)
+    catch_steps = steps[success]
+    step_p50, step_p99 = np.percentile(step_times, [50, 99]) if len(step_times) else (0.0, 0.0)
+    catch_p50, catch_p90, catch_p99 = np.percentile(catch_steps, [50, 90, 99]) if len(catch_steps) else (0, 0, 0)
+    
+    return {
+        'episodes': episodes,
+        'success_rate': float(success.mean()) if episodes else 0.0,
+        'mean_steps': float(steps.mean()) if episodes else 0.0,
+        'mean_steps_to_catch': float(catch_steps.mean()) if len(catch_steps) else 0.0,
+        'steps_to_catch_p50': float(catch_p50),
+        'steps_to_catch_p90': float(catch_p90),
+        'steps_to_catch_p99': float(catch_p99),
+        'mean_reward': float(rewards.mean()) if episodes else 0.0,
+        'batch_step_p50_ms': float(step_p50) * 1000,
+        'batch_step_p99_ms': float(step_p99) * 1000,
+        'seconds': seconds,
+        'episodes_per_second': episodes / seconds if seconds > 0 else 0.0,
+    }
+
+
+def print_report(report):
+    print(f"Episoade evaluare: {report['episodes']}")
+    print(f"Rata succes: {report['success_rate'] * 100:.1f}%")
+    print(f"Pasi medii: {report['mean_steps']:.1f}")
+    print(f"Pasi pana la prindere: medie={report['mean_steps_to_catch']:.1f} "
+          f"p50={report['steps_to_catch_p50']:.0f} p90={report['steps_to_catch_p90']:.0f} "
+          f"p99={report['steps_to_catch_p99']:.0f}")
+    print(f"Recompensa medie: {report['mean_reward']:.1f}")
+    print(f"Latenta pas vectorizat: p50={report['batch_step_p50_ms']:.2f} ms p99={report['batch_step_p99_ms']:.2f} ms")
+    print(f"Viteza evaluare: {report['episodes_per_second']:.0f} episoade/s")
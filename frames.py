@@ -0,0 +1,116 @@
+import json
+import os
+import queue
+import threading
+import numpy as np
+import pygame
+
+FRAME_FORMATS = ('raw', 'png')
+
+META_FILE = 'meta.json'
+RAW_FILE = 'frames.raw'
+
+# suprafetele de 32 de biti fara canal alfa: in memorie octetii sunt B, G, R, X
+PACKED_MASKS = (0xFF0000, 0x00FF00, 0x0000FF)
+
+
+class FrameWriter:
+    def __init__(self, path, surface, fps=30, fmt='raw', batch_frames=256, buffers=3):
+        if fmt not in FRAME_FORMATS:
+            raise ValueError(f"Format de cadre necunoscut: {fmt}")
+        if surface.get_bitsize() != 32 or tuple(surface.get_masks()[:3]) != PACKED_MASKS:
+            raise ValueError("Exportul cere o suprafata de 32 de biti in format XRGB")
+        
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.width, self.height = surface.get_size()
+        self.fps = fps
+        self.fmt = fmt
+        self.frames = 0
+        self.written = 0
+        
+        # cadrele se copiaza ca pixeli impachetati (uint32) intr-un lot prealocat; loturile pline
+        # trec la firul de scriere, iar bucla de randare continua intr-un lot liber
+        self._free = queue.Queue()
+        for _ in range(max(2, buffers)):
+            self._free.put(np.empty((batch_frames, self.height, self.width), dtype=np.uint32))
+        self._full = queue.Queue()
+        self._batch = self._free.get()
+        self._count = 0
+        self._error = None
+        
+        self._stream = open(os.path.join(path, RAW_FILE), 'wb') if fmt == 'raw' else None
+        self.thread = threading.Thread(target=self._run, name='frame-writer', daemon=True)
+        self.thread.start()
+    
+    def capture(self, surface):
+        pixels = pygame.surfarray.pixels2d(surface)
+        self._batch[self._count] = pixels.T
+        del pixels
+        
+        self._count += 1
+        self.frames += 1
+        if self._count == len(self._batch):
+            self._submit()
+    
+    def _submit(self):
+        if self._error is not None:
+            raise self._error
+        self._full.put((self._batch, self._count))
+        self._batch = self._free.get()
+        self._count = 0
+    
+    def _run(self):
+        while True:
+            item = self._full.get()
+            if item is None:
+                return
+            
+            batch, count = item
+            try:
+                if self._error is None:
+                    self._write(batch[:count])
+            except Exception as error:
+                self._error = error
+            self._free.put(batch)
+    
+    def _write(self, frames):
+        if self._stream is not None:
+            self._stream.write(frames.tobytes())
+            self.written += len(frames)
+            return
+        
+        # octetul X devine alfa opac, altfel PNG-ul ar fi transparent
+        frames |= np.uint32(0xFF000000)
+        for frame in frames:
+            image = pygame.image.frombuffer(frame.tobytes(), (self.width, self.height), 'BGRA')
+            pygame.image.save(image, os.path.join(self.path, f"frame_{self.written:06d}.png"))
+            self.written += 1
+    
+    def close(self):
+        if self._count:
+            self._submit()
+        self._full.put(None)
+        self.thread.join()
+        if self._stream is not None:
+            self._stream.close()
+        
+        with open(os.path.join(self.path, META_FILE), 'w', encoding='utf-8') as f:
+            json.dump({'format': self.fmt, 'width': self.width, 'height': self.height, 'fps': self.fps,
+                       'frames': self.written, 'pix_fmt': 'bgr0' if self.fmt == 'raw' else 'rgba'}, f, indent=2)
+        if self._error is not None:
+            raise self._error
+    
+    def ffmpeg_command(self, output='video.mp4'):
+        if self.fmt == 'raw':
+            source = (f"-f rawvideo -pix_fmt bgr0 -s {self.width}x{self.height} -r {self.fps} "
+                      f"-i {os.path.join(self.path, RAW_FILE)}")
+        else:
+            source = f"-framerate {self.fps} -i {os.path.join(self.path, 'frame_%06d.png')}"
+        return f"ffmpeg {source} -pix_fmt yuv420p {output}"
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,73 @@
+import asyncio
+import json
+import time
+import numpy as np
+
+
+async def _open(host, port, unix_path):
+    if unix_path:
+        return await asyncio.open_unix_connection(unix_path)
+    return await asyncio.open_connection(host, port)
+
+
+async def _client(host, port, unix_path, states, window, latencies, errors):
+    reader, writer = await _open(host, port, unix_path)
+    sent = {}
+    
+    async def receive():
+        for _ in range(len(states)):
+            response = json.loads(await reader.readline())
+            latencies.append(time.perf_counter() - sent.pop(response['id']))
+            if 'error' in response:
+                errors.append(response['error'])
+            in_flight.release()
+    
+    in_flight = asyncio.Semaphore(window)
+    receiver = asyncio.create_task(receive())
+    for request_id, state in enumerate(states.tolist()):
+        await in_flight.acquire()
+        sent[request_id] = time.perf_counter()
+        writer.write(json.dumps({'id': request_id, 'state': state}).encode('utf-8') + b'\n')
+        await writer.drain()
+    
+    await receiver
+    writer.close()
+
+
+async def run_load_test(host='127.0.0.1', port=8765, unix_path=None, connections=16, requests=10000,
+                        window=8, seed=0):
+    reader, writer = await _open(host, port, unix_path)
+    writer.write(b'{"op": "info"}\n')
+    info = json.loads(await reader.readline())
+    writer.close()
+    
+    rng = np.random.default_rng(seed)
+    per_connection = max(1, requests // connections)
+    shape = info['state_space_size']
+    latencies = []
+    errors = []
+    
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        _client(host, port, unix_path, rng.integers(0, shape, size=(per_connection, len(shape))),
+                window, latencies, errors)
+        for _ in range(connections)
+    ))
+    seconds = time.perf_counter() - start
+    
+    latencies = np.array(latencies) * 1000
+    return {
+        'requests': len(latencies),
+        'errors': len(errors),
+        'seconds': seconds,
+        'requests_per_second': len(latencies) / seconds,
+        'p50_ms': float(np.percentile(latencies, 50)),
+        'p99_ms': float(np.percentile(latencies, 99)),
+        'max_ms': float(latencies.max()),
+    }
+
+
+def print_load_report(report):
+    print(f"Cereri: {report['requests']} (erori: {report['errors']})")
+    print(f"Debit: {report['requests_per_second']:.0f} cereri/s")
+    print(f"Latenta: p50={report['p50_ms']:.2f} ms p99={report['p99_ms']:.2f} ms max={report['max_ms']:.2f} ms")
@@ -1,28 +1,541 @@
+import time
+
+_import_start = time.perf_counter()
+
 import argparse
 import sys
 from q_learning import QLearningTrainer
-from visualization import MazeVisualizer
-from config import Config
+from config import Config, DEFAULT_CONFIG
+
+IMPORT_TIME = time.perf_counter() - _import_start
+
+HEADLESS_COMMANDS = ('train', 'eval', 'sweep', 'diff', 'serve', 'loadtest')
+
+
+def make_progress_printer(log_every, start_time):
+    def print_progress(row):
+        episode = row['episode'] + 1
+        if log_every and episode % log_every == 0:
+            elapsed = time.perf_counter() - start_time
+            print(f"Episod {episode}: recompensa={row['reward']:.1f} pasi={row['steps']} "
+                  f"explorare={row['exploration']:.3f} ({episode / elapsed:.0f} ep/s)", flush=True)
+    return print_progress
+
+
+STATE_ENCODERS = ('distance', 'position', 'local')
+
+
+def make_state_encoder(name):
+    import environment
+    return {
+        'distance': environment.DistanceStateEncoder,
+        'position': environment.PositionStateEncoder,
+        'local': environment.LocalViewStateEncoder,
+    }[name]()
+
+
+def report_unknown_parameter(parser, error):
+    names = ', '.join(name for name in vars(Config) if name.isupper())
+    parser.error(f"{error}. Parametri valizi: {names}")
+
+
+def load_config(args, parser):
+    try:
+        config = Config.from_file(args.config) if args.config else DEFAULT_CONFIG
+        if args.set:
+            config = Config.from_assignments(args.set, base=config)
+    except AttributeError as error:
+        report_unknown_parameter(parser, error)
+    except (OSError, ValueError) as error:
+        parser.error(str(error))
+    if getattr(args, 'learning', None):
+        config = config.replace(LEARNING_MODE=args.learning)
+    if getattr(args, 'planning_between_episodes', False):
+        config = config.replace(PLANNING_BETWEEN_EPISODES=True)
+    return config
+
+
+def add_config_arguments(parser):
+    parser.add_argument('--config', metavar='FILE',
+                        help='Incarca parametrii dintr-un fisier JSON')
+    parser.add_argument('--set', action='append', metavar='NUME=VALOARE',
+                        help='Suprascrie un parametru (ex.: --set MAZE_WIDTH=12 --set REWARD_CATCH=50)')
+
+
+def trainer_state_shape(encoder, config):
+    return encoder.state_shape(config.MAZE_HEIGHT, config.MAZE_WIDTH)
+
+
+def make_replay_buffer(kind, state_dim, config):
+    if kind == 'none':
+        return None
+    
+    import replay
+    if kind == 'prioritized':
+        return replay.PrioritizedReplayBuffer(config.REPLAY_CAPACITY, state_dim,
+                                              config.PRIORITY_ALPHA, config.PRIORITY_BETA)
+    return replay.ReplayBuffer(config.REPLAY_CAPACITY, state_dim)
+
+
+def describe_learning(agent):
+    if agent.learning_mode == 'nstep':
+        return f"--learning nstep (N_STEP={agent.n_step})"
+    if agent.learning_mode == 'lambda':
+        return f"--learning lambda (TRACE_LAMBDA={agent.trace_lambda})"
+    return f"--learning {agent.learning_mode}"
+
+
+def load_trainer_checkpoint(parser, trainer, path, mmap=False, check_learning=True):
+    from checkpoint import load_checkpoint
+    try:
+        agent = load_checkpoint(path, mmap=mmap, rng=trainer.agent.rng, config=trainer.config)
+    except (OSError, ValueError, KeyError) as error:
+        parser.error(f"Checkpoint-ul {path} nu poate fi incarcat: {error}")
+    
+    expected = trainer.agent
+    loaded_shape = (*agent.state_space_size, agent.action_space_size)
+    expected_shape = (*expected.state_space_size, expected.action_space_size)
+    if loaded_shape != expected_shape:
+        parser.error(f"Checkpoint-ul {path} are tabela Q {loaded_shape}, "
+                     f"dar codificarea starii aleasa (--state) cere {expected_shape}")
+    # antrenarea continua cu modul de invatare cerut; checkpoint-ul nu il inlocuieste pe tacute
+    if check_learning and describe_learning(agent) != describe_learning(expected):
+        parser.error(f"Checkpoint-ul {path} a fost antrenat cu {describe_learning(agent)}, "
+                     f"dar s-a cerut {describe_learning(expected)}")
+    trainer.agent = agent
+
+
+def make_trainer(args, config, parser, mmap=False):
+    if args.workers > 1:
+        from parallel import ParallelQLearningTrainer
+        trainer = ParallelQLearningTrainer(args.workers, seed=args.seed or 0,
+                                           state_encoder=make_state_encoder(args.state),
+                                           reward_shaping=args.reward_shaping, config=config)
+    else:
+        encoder = make_state_encoder(args.state)
+        state_dim = len(trainer_state_shape(encoder, config))
+        trainer = QLearningTrainer(state_encoder=encoder, q_backend=args.q_backend,
+                                   replay_buffer=make_replay_buffer(args.replay, state_dim, config),
+                                   replay_ratio=args.replay_ratio, reward_shaping=args.reward_shaping,
+                                   planning_steps=args.planning_steps, seed=args.seed, config=config)
+    
+    if args.load:
+        load_trainer_checkpoint(parser, trainer, args.load, mmap=mmap, check_learning=args.episodes > 0)
+    return trainer
+
+
+def run_training(trainer, args, start_time):
+    if args.episodes <= 0:
+        return
+    
+    callback = make_progress_printer(args.log_every, start_time)
+    checkpoint = None
+    if args.save:
+        from checkpoint import CheckpointWriter
+        checkpoint = CheckpointWriter(trainer.agent, args.save,
+                                      every=args.checkpoint_every or trainer.config.CHECKPOINT_EVERY,
+                                      min_change=trainer.config.CHECKPOINT_MIN_CHANGE)
+    
+    profiler = None
+    if args.profile:
+        from profiling import Profiler
+        log_every = 0 if args.profile.endswith('.prom') else args.log_every
+        profiler = Profiler(args.profile_every or trainer.config.PROFILE_SAMPLE_EVERY,
+                            log_path=args.profile, log_every=log_every)
+    
+    recorder = None
+    if args.record:
+        from trajectory import TrajectoryRecorder
+        recorder = TrajectoryRecorder(args.record)
+    
+    if args.workers > 1:
+        trainer.train(episodes=args.episodes)
+        if checkpoint is not None:
+            checkpoint.save(args.episodes - 1)
+    elif args.batch_envs > 0:
+        trainer.train_batched(episodes=args.episodes, num_envs=args.batch_envs,
+                              callback=callback, checkpoint=checkpoint, profiler=profiler)
+    else:
+        trainer.train(episodes=args.episodes, callback=callback, checkpoint=checkpoint,
+                      recorder=recorder, profiler=profiler)
+    
+    if recorder is not None:
+        recorder.close()
+        print(f"Episoade inregistrate: {recorder.episodes} ({args.record})")
+    
+    if profiler is not None:
+        profiler.save(args.profile)
+        profiler.print_summary()
+    
+    if checkpoint is not None:
+        print(f"Checkpoint-uri scrise: {checkpoint.saves} (sarite: {checkpoint.skipped})")
+
+
+def report_times(start_time, episodes=None):
+    wall_time = time.perf_counter() - start_time
+    print(f"Timp import: {IMPORT_TIME * 1000:.1f} ms")
+    print(f"Timp total: {wall_time:.2f} s")
+    if episodes:
+        print(f"Viteza: {episodes / wall_time:.0f} episoade/s")
+
+
+def check_training_args(parser, args, config):
+    reward_shaping = args.reward_shaping or config.REWARD_SHAPING
+    if args.batch_envs > 0 and reward_shaping == 'path':
+        parser.error("--batch-envs nu suporta --reward-shaping path (doar none sau manhattan)")
+    if args.command == 'eval' and reward_shaping == 'path':
+        parser.error("eval foloseste mediul vectorizat, care nu suporta --reward-shaping path (doar none sau manhattan)")
+    if args.workers > 1 and (args.q_backend or config.Q_TABLE_BACKEND) != 'dense':
+        parser.error("--workers > 1 necesita o tabela Q densa (--q-backend dense)")
+    if args.workers > 1 and args.profile:
+        parser.error("--profile nu este suportat cu --workers > 1 (episoadele ruleaza in alte procese)")
+    if args.batch_envs > 0 and config.LEARNING_MODE != 'q':
+        parser.error(f"--batch-envs foloseste doar actualizarea Q cu un pas, nu --learning {config.LEARNING_MODE}")
+    if args.batch_envs > 0 and args.record:
+        parser.error("--record inregistreaza doar antrenarea clasica, nu --batch-envs")
+    
+    # workerii antreneaza tabela Q simpla; optiunile de mai jos ar fi ignorate in procesele lor
+    planning_steps = config.PLANNING_STEPS if args.planning_steps is None else args.planning_steps
+    if args.workers > 1:
+        for option, used in (('--replay', args.replay != 'none'), ('--planning-steps', planning_steps > 0),
+                             ('--batch-envs', args.batch_envs > 0), ('--record', bool(args.record))):
+            if used:
+                parser.error(f"{option} nu este suportat cu --workers > 1")
+
+
+def command_train(args, config, parser):
+    if args.episodes is None:
+        args.episodes = config.EPISODES
+    
+    start_time = time.perf_counter()
+    trainer = make_trainer(args, config, parser)
+    run_training(trainer, args, start_time)
+    
+    stats = trainer.training_stats
+    print(f"Episoade: {stats.count}")
+    print(f"Rata succes: {stats.mean('success') * 100:.1f}%")
+    converged = trainer.converged_episode
+    if converged is None and config.CONVERGENCE_TOLERANCE > 0 and len(stats):
+        # antrenarea paralela nu se opreste singura; convergenta se cauta in istoricul max |dQ|
+        from analytics import convergence_episode
+        converged = convergence_episode(stats['max_delta'], config.CONVERGENCE_TOLERANCE,
+                                        config.CONVERGENCE_PATIENCE)
+        if converged is not None:
+            converged += stats.count - len(stats)
+    if converged is not None:
+        print(f"Tabela Q a convers la episodul {converged + 1}")
+    if len(stats):
+        print(f"Max |dQ| in ultimul episod: {stats.last('max_delta'):.4f}")
+    if args.stats:
+        if args.stats.endswith('.csv'):
+            stats.save_csv(args.stats)
+        else:
+            stats.save_npz(args.stats)
+    report_times(start_time, args.episodes)
+
+
+def command_eval(args, config, parser):
+    if args.episodes is None:
+        args.episodes = 0 if args.load else config.EPISODES
+    
+    start_time = time.perf_counter()
+    trainer = make_trainer(args, config, parser, mmap=args.episodes <= 0)
+    run_training(trainer, args, start_time)
+    
+    import numpy as np
+    from evaluation import PolicyEvaluator, print_report
+    evaluator = PolicyEvaluator(trainer.agent, trainer.env.state_encoder, trainer.env.reward_shaping,
+                                rng=None if args.seed is None else args.seed + 1, config=config)
+    mazes = np.load(args.mazes) if args.mazes else None
+    try:
+        report = evaluator.evaluate(args.eval_episodes, mazes=mazes)
+    except ValueError as error:
+        sys.exit(f"Evaluare imposibila: {error}")
+    print_report(report)
+    report_times(start_time)
+    
+    if args.min_success is not None and report['success_rate'] < args.min_success:
+        print(f"Rata de succes sub pragul cerut ({args.min_success * 100:.1f}%)")
+        sys.exit(1)
+
+
+def command_sweep(args, config, parser):
+    import sweep
+    
+    start_time = time.perf_counter()
+    try:
+        space = sweep.parse_space(args.param)
+        if args.random:
+            trials = sweep.random_search(space, args.random, args.seed)
+        else:
+            trials = sweep.grid_search(space)
+    except AttributeError as error:
+        report_unknown_parameter(parser, error)
+    except ValueError as error:
+        parser.error(str(error))
+    
+    runner = sweep.SweepRunner(trials, workers=args.workers, min_episodes=args.min_episodes,
+                               eta=args.eta, rungs=args.rungs, window=args.window, seed=args.seed,
+                               config=config)
+    results = runner.run()
+    
+    print(f"Incercari: {len(trials)}")
+    sweep.print_results(results, args.top)
+    if args.output:
+        runner.save_csv(args.output)
+    report_times(start_time)
+
+
+def command_diff(args):
+    from analytics import compare_checkpoints
+    
+    result = compare_checkpoints(args.previous, args.current)
+    print(f"Stari comparate: {result['states']}")
+    print(f"Actiuni schimbate: {result['changed']} ({result['fraction'] * 100:.1f}%)")
+    print(f"Variatia valorii starilor: max={result['value_max']:.4f} medie={result['value_mean']:.4f}")
+
+
+def command_serve(args):
+    import asyncio
+    from server import PolicyServer
+    
+    server = PolicyServer(args.load, max_batch=args.max_batch, max_delay=args.max_delay_ms / 1000,
+                          reload_interval=args.reload_interval)
+    address = args.unix or f"{args.host}:{args.port}"
+    print(f"Server politica pe {address} (checkpoint: {args.load})", flush=True)
+    try:
+        asyncio.run(server.serve_forever(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+
+
+def command_loadtest(args):
+    import asyncio
+    from loadtest import run_load_test, print_load_report
+    
+    report = asyncio.run(run_load_test(args.host, args.port, args.unix, connections=args.connections,
+                                       requests=args.requests, window=args.window))
+    print_load_report(report)
+
+
+def build_headless_parser():
+    parser = argparse.ArgumentParser(
+        description='Tom & Jerry Q-Learning - antrenare/evaluare fara interfata grafica'
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    for name, help_text in (('train', 'Antrenare fara vizualizare'),
+                            ('eval', 'Antrenare urmata de evaluare greedy')):
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument('--episodes', type=int, default=None,
+                         help='Numar de episoade de antrenare')
+        sub.add_argument('--log-every', type=int, default=100,
+                         help='Afiseaza progresul la fiecare N episoade (0 = niciodata)')
+        sub.add_argument('--batch-envs', type=int, default=0,
+                         help='Numar de labirinturi simulate in paralel (0 = antrenare clasica)')
+        sub.add_argument('--workers', type=int, default=1,
+                         help='Numar de procese de antrenare')
+        sub.add_argument('--state', choices=STATE_ENCODERS, default='distance',
+                         help='Codificarea starii vazute de agent')
+        sub.add_argument('--q-backend', choices=('dense', 'sparse'), default=None,
+                         help='Tabela Q densa sau rara (alocata doar pentru starile vizitate)')
+        sub.add_argument('--reward-shaping', choices=('none', 'manhattan', 'path'), default=None,
+                         help='Recompensa pentru apropiere: distanta Manhattan sau drumul cel mai scurt (BFS)')
+        sub.add_argument('--learning', choices=('q', 'nstep', 'lambda'), default=None,
+                         help='Actualizare Q cu un pas, randamente pe n pasi sau Q(lambda) Watkins')
+        sub.add_argument('--replay', choices=('none', 'uniform', 'prioritized'), default='none',
+                         help='Buffer de experienta reluata')
+        sub.add_argument('--replay-ratio', type=float, default=None,
+                         help='Tranzitii reluate pentru fiecare pas real')
+        sub.add_argument('--planning-steps', type=int, default=None,
+                         help='Dyna-Q: actualizari simulate din modelul invatat pentru fiecare pas real')
+        sub.add_argument('--planning-between-episodes', action='store_true',
+                         help='Actualizarile simulate ale unui episod se fac la finalul lui, nu la fiecare pas')
+        sub.add_argument('--seed', type=int, default=None,
+                         help='Seed pentru rezultate reproductibile')
+        sub.add_argument('--load', metavar='DIR',
+                         help='Incarca un checkpoint inainte de antrenare')
+        sub.add_argument('--save', metavar='DIR',
+                         help='Salveaza checkpoint-uri periodice in acest director')
+        sub.add_argument('--checkpoint-every', type=int, default=None,
+                         help='Intervalul (in episoade) dintre checkpoint-uri')
+        sub.add_argument('--profile', metavar='FILE',
+                         help='Profil pe faze: .prom = format Prometheus, altfel log JSON (o linie per raport)')
+        sub.add_argument('--profile-every', type=int, default=None,
+                         help='Cronometreaza fazele doar intr-un episod din N')
+        sub.add_argument('--record', metavar='DIR',
+                         help='Scrie traiectoriile episoadelor intr-un jurnal binar (doar antrenarea clasica)')
+        add_config_arguments(sub)
+    
+    sweep_parser = subparsers.add_parser('sweep', help='Cautare de hiperparametri cu oprire timpurie')
+    sweep_parser.add_argument('--param', action='append', required=True, metavar='NUME=VALORI',
+                              help='Ex.: LEARNING_RATE=0.1,0.3,0.6 sau DISCOUNT_FACTOR=0.8:0.99')
+    sweep_parser.add_argument('--random', type=int, default=0,
+                              help='Numar de incercari aleatoare (0 = grila completa)')
+    sweep_parser.add_argument('--workers', type=int, default=None, help='Numar de procese')
+    sweep_parser.add_argument('--min-episodes', type=int, default=100,
+                              help='Episoade pe incercare in prima treapta')
+    sweep_parser.add_argument('--eta', type=int, default=3,
+                              help='La fiecare treapta ramane 1/eta din incercari')
+    sweep_parser.add_argument('--rungs', type=int, default=3, help='Numar de trepte')
+    sweep_parser.add_argument('--window', type=int, default=100,
+                              help='Fereastra pentru rata de succes folosita la clasare')
+    sweep_parser.add_argument('--seed', type=int, default=0)
+    sweep_parser.add_argument('--top', type=int, default=10, help='Rezultate afisate')
+    sweep_parser.add_argument('--output', metavar='FILE', help='Scrie tabelul de rezultate (CSV)')
+    add_config_arguments(sweep_parser)
+    
+    for name, help_text in (('serve', 'Server asyncio care raspunde cu actiunea politicii'),
+                            ('loadtest', 'Test de incarcare pentru serverul de politica')):
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument('--host', default='127.0.0.1')
+        sub.add_argument('--port', type=int, default=8765)
+        sub.add_argument('--unix', metavar='PATH', help='Socket Unix in loc de TCP')
+    
+    serve_parser = subparsers.choices['serve']
+    serve_parser.add_argument('--load', metavar='DIR', required=True, help='Checkpoint-ul servit')
+    serve_parser.add_argument('--max-batch', type=int, default=1024,
+                              help='Numar maxim de cereri grupate intr-o cautare vectorizata')
+    serve_parser.add_argument('--max-delay-ms', type=float, default=0.0,
+                              help='Cat asteapta gruparea dupa prima cerere cand nu mai sunt alte cereri')
+    serve_parser.add_argument('--reload-interval', type=float, default=1.0,
+                              help='Intervalul (secunde) de verificare a unui checkpoint nou')
+    
+    loadtest_parser = subparsers.choices['loadtest']
+    loadtest_parser.add_argument('--connections', type=int, default=16)
+    loadtest_parser.add_argument('--requests', type=int, default=20000)
+    loadtest_parser.add_argument('--window', type=int, default=8,
+                                 help='Cereri in zbor pe conexiune')
+    
+    diff_parser = subparsers.add_parser('diff', help='Compara politicile a doua checkpoint-uri')
+    diff_parser.add_argument('previous', metavar='DIR_VECHI')
+    diff_parser.add_argument('current', metavar='DIR_NOU')
+    
+    subparsers.choices['train'].add_argument('--stats', metavar='FILE',
+                                             help='Exporta statisticile de antrenare (.npz sau .csv)')
+    eval_parser = subparsers.choices['eval']
+    eval_parser.add_argument('--eval-episodes', type=int, default=1000,
+                             help='Numar de labirinturi noi pentru evaluarea greedy (fara invatare)')
+    eval_parser.add_argument('--mazes', metavar='FILE',
+                             help='Evalueaza pe labirinturi fixe dintr-un fisier .npy (N, inaltime, latime)')
+    eval_parser.add_argument('--min-success', type=float, default=None,
+                             help='Iesire cu cod 1 daca rata de succes este sub acest prag (0-1)')
+    return parser
+
+
+def export_frames(visualizer, args, log=None):
+    from frames import FrameWriter
+    
+    start_time = time.perf_counter()
+    with FrameWriter(args.export, visualizer.screen, visualizer.fps, args.export_format) as writer:
+        if log is not None:
+            visualizer.export_replay(writer, log, args.start)
+        else:
+            visualizer.export_training(writer, args.episodes)
+    elapsed = time.perf_counter() - start_time
+    
+    visualizer.show_final_results(visualizer.episode_count)
+    print(f"Cadre exportate: {writer.written} ({visualizer.screen_width}x{visualizer.screen_height}) "
+          f"in {elapsed:.2f} s ({writer.written / max(elapsed, 1e-9):.0f} cadre/s)")
+    print(f"Video: {writer.ffmpeg_command()}")
+
 
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] in HEADLESS_COMMANDS:
+        parser = build_headless_parser()
+        args = parser.parse_args()
+        if args.command in ('train', 'eval', 'sweep'):
+            config = load_config(args, parser)
+        if args.command in ('train', 'eval'):
+            check_training_args(parser, args, config)
+        
+        if args.command == 'train':
+            command_train(args, config, parser)
+        elif args.command == 'sweep':
+            command_sweep(args, config, parser)
+        elif args.command == 'diff':
+            command_diff(args)
+        elif args.command == 'serve':
+            command_serve(args)
+        elif args.command == 'loadtest':
+            command_loadtest(args)
+        else:
+            command_eval(args, config, parser)
+        return
+    
     parser = argparse.ArgumentParser(
         description='Tom & Jerry Q-Learning - Vizualizare algoritm',
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
+Moduri fara interfata grafica:
+  python main.py train --episodes 5000
+  python main.py eval --episodes 2000 --eval-episodes 500
+  python main.py train --episodes 5000 --save checkpoints/run1
+  python main.py eval --load checkpoints/run1
+
+Antrenare in fundal cu vizualizare esantionata:
+  python main.py --live --train-episodes 20000 --snapshot-every 200
+
+Export de cadre fara fereastra (servere fara ecran):
+  python main.py 200 --export frames/run1 --set CELL_SIZE=16
         """
     )
     
     parser.add_argument('episodes', type=int, nargs='?', default=10,
                        help='Numar de episoade de vizualizat')
+    parser.add_argument('--load', metavar='DIR',
+                       help='Porneste de la un checkpoint in loc de pre-antrenare')
+    parser.add_argument('--live', action='store_true',
+                       help='Antrenare la viteza maxima in fundal; se afiseaza doar episoade esantionate')
+    parser.add_argument('--train-episodes', type=int, default=None,
+                       help='Episoade de antrenare in modul --live')
+    parser.add_argument('--snapshot-every', type=int, default=None,
+                       help='In modul --live se publica un episod din N')
+    parser.add_argument('--replay', metavar='DIR',
+                       help='Reda un jurnal de traiectorii (fara mediu si fara agent); sageti/PageUp/PageDown = salt')
+    parser.add_argument('--start', type=int, default=0,
+                       help='Episodul de la care incepe reluarea')
+    parser.add_argument('--export', metavar='DIR',
+                       help='Randare fara fereastra, la viteza maxima; cadrele se scriu in acest director')
+    parser.add_argument('--export-format', choices=('raw', 'png'), default='raw',
+                       help='Flux video brut (bgr0, pentru ffmpeg) sau secventa de imagini PNG')
+    add_config_arguments(parser)
     
     args = parser.parse_args()
+    config = load_config(args, parser)
 
-    trainer = QLearningTrainer()
+    from visualization import MazeVisualizer
+    
+    if args.replay:
+        from trajectory import TrajectoryLog
+        log = TrajectoryLog(args.replay)
+        if not len(log):
+            parser.error(f"Jurnalul de traiectorii {args.replay} nu contine inca episoade")
+        visualizer = MazeVisualizer.for_replay(log, config, offscreen=bool(args.export))
+        if args.export:
+            export_frames(visualizer, args, log)
+        else:
+            visualizer.run_replay_visualization(log, args.start)
+        return
+    trainer = QLearningTrainer(config=config)
+    
+    if args.load:
+        load_trainer_checkpoint(parser, trainer, args.load)
+    elif not args.live:
+        trainer.train(episodes=min(100, args.episodes * 2))
+    
+    if args.export:
+        export_frames(MazeVisualizer(trainer.env, trainer.agent, offscreen=True), args)
+        return
     
-    trainer.train(episodes=min(100, args.episodes * 2))
+    if args.live:
+        from background import BackgroundTrainer
+        background = BackgroundTrainer(trainer, args.train_episodes, args.snapshot_every)
+        MazeVisualizer(trainer.env, trainer.agent).run_snapshot_visualization(background)
+        return
     
     visualizer = MazeVisualizer(trainer.env, trainer.agent)
     visualizer.run_training_visualization(num_episodes=args.episodes)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,156 @@
+import multiprocessing as mp
+import time
+from multiprocessing import shared_memory
+import numpy as np
+from q_learning import QLearningTrainer
+from config import Config, DEFAULT_CONFIG
+from stats import TrainingStats, TRAINING_COLUMNS
+
+PARALLEL_COLUMNS = TRAINING_COLUMNS + (('worker', np.int32),)
+
+
+def _train_worker(args):
+    (shm_name, num_workers, shape, worker_id, seed_sequence, episodes, exploration_rate,
+     state_encoder, reward_shaping, config) = args
+    
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        tables = np.ndarray((num_workers + 1,) + shape, dtype=np.float64, buffer=shm.buf)
+        
+        trainer = QLearningTrainer(state_encoder=state_encoder, reward_shaping=reward_shaping,
+                                   seed=seed_sequence, config=config)
+        # o runda are cel mult SYNC_INTERVAL episoade; inelul STATS_RING_SIZE se aplica in procesul principal
+        trainer.training_stats = TrainingStats(0)
+        trainer.agent.q_table[:] = tables[0]
+        trainer.agent.exploration_rate = exploration_rate
+        trainer.train(episodes)
+        
+        tables[worker_id + 1] = trainer.agent.q_table
+        del tables
+        return worker_id, trainer.training_stats.count, trainer.training_stats.to_dict()
+    finally:
+        shm.close()
+
+
+class ParallelQLearningTrainer(QLearningTrainer):
+    def __init__(self, num_workers=None, sync_interval=None, seed=0, state_encoder=None, reward_shaping=None,
+                 config=DEFAULT_CONFIG):
+        super().__init__(state_encoder=state_encoder, reward_shaping=reward_shaping, seed=seed, config=config)
+        if self.agent.q_backend != 'dense':
+            raise ValueError("Antrenarea paralela necesita o tabela Q densa")
+        self.num_workers = num_workers or mp.cpu_count()
+        self.sync_interval = sync_interval or config.SYNC_INTERVAL
+        self.seed = seed
+        self.rounds = 0
+        self.training_stats = TrainingStats(config.STATS_RING_SIZE, columns=PARALLEL_COLUMNS)
+        self.worker_seeds = self.seed_sequence.spawn(1)[0]
+    
+    def _split_round(self, remaining):
+        per_worker = min(self.sync_interval, -(-remaining // self.num_workers))
+        counts = []
+        for _ in range(self.num_workers):
+            count = min(per_worker, remaining)
+            counts.append(count)
+            remaining -= count
+        return counts
+    
+    def train(self, episodes=None):
+        if episodes is None:
+            episodes = self.config.EPISODES
+        shape = self.agent.q_table.shape
+        nbytes = (self.num_workers + 1) * self.agent.q_table.nbytes
+        shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        
+        try:
+            tables = np.ndarray((self.num_workers + 1,) + shape, dtype=np.float64, buffer=shm.buf)
+            tables[0] = self.agent.q_table
+            
+            with mp.Pool(self.num_workers) as pool:
+                remaining = episodes
+                while remaining > 0:
+                    counts = self._split_round(remaining)
+                    seeds = self.worker_seeds.spawn(self.num_workers)
+                    jobs = [
+                        (shm.name, self.num_workers, shape, worker_id, seeds[worker_id],
+                         count, self.agent.exploration_rate, self.env.state_encoder, self.env.reward_shaping,
+                         self.config)
+                        for worker_id, count in enumerate(counts) if count > 0
+                    ]
+                    
+                    results = sorted(pool.map(_train_worker, jobs), key=lambda r: r[0])
+                    # fiecare worker conteaza proportional cu episoadele jucate efectiv in runda
+                    # (un worker se poate opri mai devreme daca tabela lui converge)
+                    weights = np.array([r[1] for r in results], dtype=np.float64)
+                    self._merge(tables, [r[0] for r in results], weights)
+                    
+                    for worker_id, _, stats in results:
+                        size = len(stats['episode'])
+                        self.agent.history.extend(
+                            reward=stats['reward'], steps=stats['steps'], exploration=stats['exploration'])
+                        self.training_stats.extend(
+                            episode=self.training_stats.count + np.arange(size),
+                            reward=stats['reward'],
+                            steps=stats['steps'],
+                            success=stats['success'],
+                            exploration=stats['exploration'],
+                            max_delta=stats['max_delta'],
+                            worker=np.full(size, worker_id),
+                        )
+                    
+                    # explorarea scade ca in antrenarea seriala: cu toate episoadele jucate in runda,
+                    # nu doar cu cele ale unui singur worker
+                    agent = self.agent
+                    agent.exploration_rate = max(agent.min_exploration_rate,
+                                                 agent.exploration_rate * agent.exploration_decay ** weights.sum())
+                    remaining -= sum(counts)
+                    self.rounds += 1
+            
+            del tables
+        finally:
+            shm.close()
+            shm.unlink()
+        
+        return self.agent
+    
+    def _merge(self, tables, worker_ids, weights):
+        # media ponderata in ordinea fixa a workerilor => acelasi rezultat la acelasi seed
+        merged = np.zeros_like(tables[0])
+        for worker_id, weight in zip(worker_ids, weights):
+            merged += weight * tables[worker_id + 1]
+        merged /= weights.sum()
+        
+        tables[0] = merged
+        self.agent.q_table[:] = merged
+
+
+def measure_scaling(episodes=Config.EPISODES, worker_counts=None, sync_interval=Config.SYNC_INTERVAL, seed=0):
+    if worker_counts is None:
+        worker_counts = sorted({1, 2, 4, mp.cpu_count()})
+    
+    report = []
+    for num_workers in worker_counts:
+        trainer = ParallelQLearningTrainer(num_workers, sync_interval, seed)
+        
+        start_time = time.perf_counter()
+        trainer.train(episodes)
+        elapsed = time.perf_counter() - start_time
+        
+        report.append({
+            'workers': num_workers,
+            'seconds': elapsed,
+            'episodes_per_sec': episodes / elapsed,
+            'success_rate': trainer.training_stats.mean('success'),
+        })
+    
+    base = report[0]['episodes_per_sec']
+    for row in report:
+        row['speedup'] = row['episodes_per_sec'] / base
+    
+    return report
+
+
+def print_scaling_report(report):
+    print(f"{'Workeri':>8} {'Secunde':>10} {'Episoade/s':>12} {'Accelerare':>11} {'Succes':>8}")
+    for row in report:
+        print(f"{row['workers']:>8} {row['seconds']:>10.2f} {row['episodes_per_sec']:>12.1f} "
+              f"{row['speedup']:>10.2f}x {row['success_rate'] * 100:>7.1f}%")
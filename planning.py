@@ -0,0 +1,104 @@
+import numpy as np
+from rng import make_rng
+
+
+class DynaModel:
+    def __init__(self, state_space_size, action_space_size, capacity=1024, rng=None):
+        self.state_space_size = tuple(state_space_size)
+        self.action_space_size = action_space_size
+        self.rng = make_rng(rng)
+        
+        strides = []
+        stride = 1
+        for size in reversed(self.state_space_size):
+            strides.append(stride)
+            stride *= size
+        self.strides = tuple(reversed(strides))
+        
+        # un rand pentru fiecare pereche (stare, actiune) observata: frecventa finalurilor de episod,
+        # recompensa medie separat pentru tranzitiile finale si cele obisnuite, ultima stare urmatoare
+        state_dim = len(self.state_space_size)
+        self.states = np.zeros((capacity, state_dim), dtype=np.intp)
+        self.actions = np.zeros(capacity, dtype=np.intp)
+        self.counts = np.zeros(capacity, dtype=np.int64)
+        self.reward_sums = np.zeros(capacity)
+        self.done_counts = np.zeros(capacity, dtype=np.int64)
+        self.done_reward_sums = np.zeros(capacity)
+        self.next_states = np.zeros((capacity, state_dim), dtype=np.intp)
+        self.index = {}
+        self.size = 0
+    
+    def __len__(self):
+        return self.size
+    
+    @property
+    def nbytes(self):
+        return (self.states.nbytes + self.actions.nbytes + self.counts.nbytes + self.reward_sums.nbytes
+                + self.done_counts.nbytes + self.done_reward_sums.nbytes + self.next_states.nbytes)
+    
+    def _key(self, state, action):
+        key = 0
+        for value, stride in zip(state, self.strides):
+            key += value * stride
+        return key * self.action_space_size + action
+    
+    def _grow(self):
+        capacity = max(2 * len(self.actions), 1024)
+        size = self.size
+        for name in ('states', 'actions', 'counts', 'reward_sums', 'done_counts', 'done_reward_sums', 'next_states'):
+            old = getattr(self, name)
+            new = np.zeros((capacity, *old.shape[1:]), dtype=old.dtype)
+            new[:size] = old[:size]
+            setattr(self, name, new)
+    
+    def _insert(self, key, state, action):
+        if self.size >= len(self.actions):
+            self._grow()
+        row = self.size
+        self.states[row] = state
+        self.actions[row] = action
+        self.index[key] = row
+        self.size = row + 1
+        return row
+    
+    def update(self, state, action, reward, next_state, done):
+        key = self._key(state, action)
+        row = self.index.get(key)
+        if row is None:
+            row = self._insert(key, state, action)
+        
+        self.counts[row] += 1
+        if done:
+            self.done_counts[row] += 1
+            self.done_reward_sums[row] += reward
+        else:
+            self.reward_sums[row] += reward
+            self.next_states[row] = next_state
+    
+    def update_batch(self, states, actions, rewards, next_states, dones):
+        keys = (np.asarray(states, dtype=np.int64) @ np.array(self.strides, dtype=np.int64)) * self.action_space_size + actions
+        index = self.index
+        rows = np.empty(len(keys), dtype=np.intp)
+        for i, key in enumerate(keys.tolist()):
+            row = index.get(key)
+            if row is None:
+                row = self._insert(key, states[i], actions[i])
+            rows[i] = row
+        
+        dones = np.asarray(dones, dtype=bool)
+        np.add.at(self.counts, rows, 1)
+        np.add.at(self.done_counts, rows[dones], 1)
+        np.add.at(self.done_reward_sums, rows[dones], rewards[dones])
+        np.add.at(self.reward_sums, rows[~dones], rewards[~dones])
+        self.next_states[rows[~dones]] = next_states[~dones]
+    
+    def sample(self, batch_size):
+        rows = self.rng.integers(0, self.size, batch_size)
+        counts = self.counts[rows]
+        done_counts = self.done_counts[rows]
+        
+        # finalul de episod se trage cu frecventa observata; recompensa este media ramurii alese
+        dones = self.rng.random(batch_size) * counts < done_counts
+        rewards = np.where(dones, self.done_reward_sums[rows] / np.maximum(done_counts, 1),
+                           self.reward_sums[rows] / np.maximum(counts - done_counts, 1))
+        return self.states[rows], self.actions[rows], rewards, self.next_states[rows], dones
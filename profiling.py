@@ -0,0 +1,167 @@
+import bisect
+import json
+import time
+
+PHASES = ('reset', 'action', 'step', 'learn', 'replay', 'plan', 'stats')
+
+# limite (secunde) pentru histograma duratei unui episod
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+
+class Profiler:
+    def __init__(self, sample_every=10, buckets=LATENCY_BUCKETS, log_path=None, log_every=0):
+        self.sample_every = max(1, sample_every)
+        self.buckets = tuple(buckets)
+        self.log_path = log_path
+        self.log_every = log_every
+        self.reset()
+    
+    def reset(self):
+        self.phase_seconds = dict.fromkeys(PHASES, 0.0)
+        self.phase_calls = dict.fromkeys(PHASES, 0)
+        self.episodes = 0
+        self.sampled_episodes = 0
+        self.steps = 0
+        self.sampled_steps = 0
+        self.episode_seconds = 0.0
+        self.bucket_counts = [0] * (len(self.buckets) + 1)
+        self.batches = 0
+        self.batch_seconds = 0.0
+        self.batch_bucket_counts = [0] * (len(self.buckets) + 1)
+        self.started = time.perf_counter()
+    
+    def sampled(self, episode):
+        return episode % self.sample_every == 0
+    
+    def timed(self, phase, function):
+        seconds = self.phase_seconds
+        calls = self.phase_calls
+        clock = time.perf_counter
+        
+        def wrapper(*args, **kwargs):
+            start = clock()
+            result = function(*args, **kwargs)
+            seconds[phase] += clock() - start
+            calls[phase] += 1
+            return result
+        return wrapper
+    
+    def add(self, phase, seconds):
+        self.phase_seconds[phase] += seconds
+        self.phase_calls[phase] += 1
+    
+    def end_episode(self, seconds, steps, sampled):
+        self.episodes += 1
+        self.steps += steps
+        self.episode_seconds += seconds
+        self.bucket_counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        if sampled:
+            self.sampled_episodes += 1
+            self.sampled_steps += steps
+        
+        if self.log_path and self.log_every and self.episodes % self.log_every == 0:
+            self.append_log(self.log_path)
+    
+    def end_batch(self, seconds, steps, episodes, sampled):
+        # in antrenarea in lot episoadele nu au o durata proprie: se masoara fiecare pas vectorizat
+        logged = self.episodes // self.log_every if self.log_every else 0
+        self.steps += steps
+        self.episodes += episodes
+        self.batches += 1
+        self.batch_seconds += seconds
+        self.batch_bucket_counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        if sampled:
+            self.sampled_episodes += episodes
+            self.sampled_steps += steps
+        
+        if self.log_path and self.log_every and self.episodes // self.log_every > logged:
+            self.append_log(self.log_path)
+    
+    def summary(self):
+        wall = time.perf_counter() - self.started
+        # fazele sunt cronometrate doar in episoadele esantionate; totalurile se extrapoleaza
+        scale = self.steps / self.sampled_steps if self.sampled_steps else 0.0
+        return {
+            'episodes': self.episodes,
+            'steps': self.steps,
+            'sampled_episodes': self.sampled_episodes,
+            'sampled_steps': self.sampled_steps,
+            'wall_seconds': wall,
+            'steps_per_second': self.steps / wall if wall > 0 else 0.0,
+            'episode_seconds': self.episode_seconds,
+            'phase_seconds': dict(self.phase_seconds),
+            'phase_calls': dict(self.phase_calls),
+            'estimated_phase_seconds': {phase: seconds * scale for phase, seconds in self.phase_seconds.items()},
+            'episode_latency_buckets': dict(zip([str(b) for b in self.buckets] + ['+Inf'], self.bucket_counts)),
+            'batches': self.batches,
+            'batch_seconds': self.batch_seconds,
+            'batch_latency_buckets': dict(zip([str(b) for b in self.buckets] + ['+Inf'], self.batch_bucket_counts)),
+        }
+    
+    def append_log(self, path):
+        record = {'time': time.time(), **self.summary()}
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record) + '\n')
+    
+    def to_prometheus(self, prefix='qlearning'):
+        summary = self.summary()
+        lines = [
+            f"# HELP {prefix}_episodes_total Episoade de antrenare terminate",
+            f"# TYPE {prefix}_episodes_total counter",
+            f"{prefix}_episodes_total {summary['episodes']}",
+            f"# HELP {prefix}_steps_total Pasi in mediu",
+            f"# TYPE {prefix}_steps_total counter",
+            f"{prefix}_steps_total {summary['steps']}",
+            f"# HELP {prefix}_steps_per_second Pasi pe secunda de la pornirea profilerului",
+            f"# TYPE {prefix}_steps_per_second gauge",
+            f"{prefix}_steps_per_second {summary['steps_per_second']:.6g}",
+            f"# HELP {prefix}_phase_seconds_total Timp estimat pe faza (extrapolat din esantioane)",
+            f"# TYPE {prefix}_phase_seconds_total counter",
+        ]
+        for phase, seconds in summary['estimated_phase_seconds'].items():
+            lines.append(f'{prefix}_phase_seconds_total{{phase="{phase}"}} {seconds:.6g}')
+        
+        if any(self.bucket_counts) or not self.batches:
+            lines += self._histogram(f"{prefix}_episode_duration_seconds", "Durata unui episod",
+                                     self.bucket_counts, self.episode_seconds)
+        if self.batches:
+            lines += self._histogram(f"{prefix}_batch_duration_seconds",
+                                     "Durata unui pas vectorizat (antrenare in lot)",
+                                     self.batch_bucket_counts, self.batch_seconds)
+        return '\n'.join(lines) + '\n'
+    
+    def _histogram(self, name, help_text, bucket_counts, total_seconds):
+        lines = [
+            f"# HELP {name} {help_text}",
+            f"# TYPE {name} histogram",
+        ]
+        cumulative = 0
+        for bound, count in zip(self.buckets + (None,), bucket_counts):
+            cumulative += count
+            le = '+Inf' if bound is None else f'{bound:g}'
+            lines.append(f'{name}_bucket{{le="{le}"}} {cumulative}')
+        lines.append(f"{name}_sum {total_seconds:.6g}")
+        lines.append(f"{name}_count {cumulative}")
+        return lines
+    
+    def write_prometheus(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.to_prometheus())
+    
+    def save(self, path):
+        if path.endswith('.prom'):
+            self.write_prometheus(path)
+        else:
+            self.append_log(path)
+    
+    def print_summary(self):
+        summary = self.summary()
+        estimated = summary['estimated_phase_seconds']
+        total = sum(estimated.values()) or 1.0
+        print(f"Profil: {summary['sampled_episodes']}/{summary['episodes']} episoade esantionate, "
+              f"{summary['steps_per_second']:.0f} pasi/s")
+        for phase in PHASES:
+            if summary['phase_calls'][phase]:
+                print(f"  {phase:<8} {estimated[phase]:8.3f} s  {estimated[phase] / total * 100:5.1f}%")
+        if self.batches:
+            print(f"  pasi vectorizati: {self.batches}, medie {self.batch_seconds / self.batches * 1000:.3f} ms")
@@ -1,56 +1,291 @@
 import numpy as np
 import time
-from environment import MazeEnvironment
+from environment import MazeEnvironment, BatchedMazeEnvironment, MazePool
 from agent import QLearningAgent
-from config import Config
+from config import DEFAULT_CONFIG
+from stats import TrainingStats
+from rng import make_rng
+from planning import DynaModel
 
 class QLearningTrainer:
-    def __init__(self):
-        self.env = MazeEnvironment()
+    def __init__(self, maze_pool=None, state_encoder=None, q_backend=None,
+                 replay_buffer=None, replay_ratio=None, replay_batch_size=None,
+                 reward_shaping=None, planning_steps=None, seed=None, config=DEFAULT_CONFIG):
+        self.config = config
+        if isinstance(seed, np.random.SeedSequence):
+            self.seed_sequence = seed
+        else:
+            self.seed_sequence = np.random.SeedSequence(seed)
+        env_seed, agent_seed, replay_seed, pool_seed = self.seed_sequence.spawn(4)
         
-        max_distance_y = Config.MAZE_HEIGHT - 1
-        max_distance_x = Config.MAZE_WIDTH - 1
-        state_space_size = (max_distance_y + 1, max_distance_x + 1)
+        if maze_pool is None and config.MAZE_POOL_SIZE > 0:
+            maze_pool = MazePool(config.MAZE_POOL_SIZE, config.MAZE_WIDTH, config.MAZE_HEIGHT,
+                                 rng=make_rng(pool_seed))
+        self.env = MazeEnvironment(maze_pool=maze_pool, state_encoder=state_encoder,
+                                   reward_shaping=reward_shaping, rng=make_rng(env_seed), config=config)
+        
+        state_space_size = self.env.state_shape
         
         action_space_size = 4
         
-        self.agent = QLearningAgent(state_space_size, action_space_size)
-        self.training_stats = []
+        self.agent = QLearningAgent(state_space_size, action_space_size, q_backend,
+                                    rng=make_rng(agent_seed), config=config)
+        self.training_stats = TrainingStats(config.STATS_RING_SIZE)
+        
+        if replay_buffer is not None and seed is not None:
+            replay_buffer.rng = make_rng(replay_seed)
+        self.replay_buffer = replay_buffer
+        self.replay_ratio = config.REPLAY_RATIO if replay_ratio is None else replay_ratio
+        self.replay_batch_size = replay_batch_size or config.REPLAY_BATCH_SIZE
+        self._replay_credit = 0.0
+        
+        self.planning_steps = config.PLANNING_STEPS if planning_steps is None else planning_steps
+        self.planning_batch_size = config.PLANNING_BATCH_SIZE
+        self.model = None
+        if self.planning_steps > 0:
+            self.model = DynaModel(state_space_size, action_space_size,
+                                   rng=make_rng(self.seed_sequence.spawn(1)[0]))
+        self._planning_credit = 0.0
+        self.env_steps = 0
+        self.converged_episode = None
+        self._calm_episodes = 0
+    
+    def _replay(self, new_transitions):
+        buffer = self.replay_buffer
+        self._replay_credit += self.replay_ratio * new_transitions
+        
+        if len(buffer) < self.replay_batch_size:
+            return
+        
+        while self._replay_credit >= self.replay_batch_size:
+            batch, idx, weights = buffer.sample(self.replay_batch_size)
+            td_errors = self.agent.learn_batch(*batch, weights=weights)
+            buffer.update_priorities(idx, td_errors)
+            self._replay_credit -= self.replay_batch_size
     
-    def train(self, episodes=Config.EPISODES):
+    def _plan(self, new_transitions):
+        # Dyna-Q: PLANNING_STEPS actualizari simulate din model pentru fiecare pas real, grupate in loturi
+        self._planning_credit += self.planning_steps * new_transitions
+        batch_size = self.planning_batch_size
+        
+        while self._planning_credit >= batch_size:
+            self.agent.learn_batch(*self.model.sample(batch_size))
+            self._planning_credit -= batch_size
+    
+    def _check_convergence(self, max_delta):
+        # convergenta: CONVERGENCE_PATIENCE episoade consecutive cu max |dQ| sub prag
+        tolerance = self.config.CONVERGENCE_TOLERANCE
+        if tolerance <= 0:
+            return False
+        
+        self._calm_episodes = self._calm_episodes + 1 if max_delta < tolerance else 0
+        if self._calm_episodes >= self.config.CONVERGENCE_PATIENCE:
+            self.converged_episode = self.training_stats.count - 1
+            return True
+        return False
+    
+    def train(self, episodes=None, callback=None, checkpoint=None, recorder=None, profiler=None):
+        if episodes is None:
+            episodes = self.config.EPISODES
         start_time = time.time()
         successes = 0
+        env = self.env
+        agent = self.agent
+        replay_buffer = self.replay_buffer
+        max_steps = self.config.MAX_STEPS_PER_EPISODE
+        get_action, step, learn = agent.get_action, env.step, agent.learn
+        replay = self._replay
+        model = self.model
+        plan = self._plan
+        
+        # planificarea amanata ruleaza la finalul episodului, tot pe firul principal
+        deferred = model is not None and self.config.PLANNING_BETWEEN_EPISODES
+        
+        # profilerul inlocuieste functiile doar in episoadele esantionate; fara profiler bucla ramane neschimbata
+        if profiler is not None:
+            clock = time.perf_counter
+            plain = get_action, step, learn, replay, plan
+            timed = (profiler.timed('action', get_action), profiler.timed('step', step),
+                     profiler.timed('learn', learn), profiler.timed('replay', replay),
+                     profiler.timed('plan', plan))
         
         for episode in range(episodes):
-            state = self.env.reset()
+            if profiler is not None:
+                sampled = profiler.sampled(episode)
+                get_action, step, learn, replay, plan = timed if sampled else plain
+                episode_start = clock()
+            
+            state = env.reset()
+            if profiler is not None and sampled:
+                profiler.add('reset', clock() - episode_start)
             total_reward = 0
             steps = 0
             episode_done = False
             
-            while not episode_done and steps < Config.MAX_STEPS_PER_EPISODE:
-                action = self.agent.get_action(state)
+            if recorder is not None:
+                recorder.start_episode(env)
+            
+            while not episode_done and steps < max_steps:
+                action = get_action(state)
+                
+                next_state, reward, done = step(action)
+                
+                learn(state, action, reward, next_state, done)
+                
+                if recorder is not None:
+                    recorder.record_step(env, action, reward)
                 
-                next_state, reward, done = self.env.step(action)
+                if replay_buffer is not None:
+                    replay_buffer.add(state, action, reward, next_state, done)
+                    replay(1)
                 
-                self.agent.learn(state, action, reward, next_state, done)
+                if model is not None:
+                    model.update(state, action, reward, next_state, done)
+                    if not deferred:
+                        plan(1)
                 
                 state = next_state
                 total_reward += reward
                 steps += 1
                 episode_done = done
             
-            if self.env.cat_pos == self.env.mouse_pos:
+            if profiler is not None and sampled:
+                stats_start = clock()
+            
+            if env.cat_pos == env.mouse_pos:
                 successes += 1
+            self.env_steps += steps
+            
+            if deferred:
+                plan(steps)
+            
+            agent.record_episode(total_reward, steps)
+            agent.update_exploration_rate()
+            max_delta = agent.pop_max_delta()
+            
+            self.training_stats.append(
+                episode=self.training_stats.count,
+                reward=total_reward,
+                steps=steps,
+                success=env.cat_pos == env.mouse_pos,
+                exploration=agent.exploration_rate,
+                max_delta=max_delta
+            )
+            
+            if recorder is not None:
+                recorder.end_episode(env, self.training_stats)
             
-            self.agent.record_episode(total_reward, steps)
-            self.agent.update_exploration_rate()
+            if callback is not None:
+                callback(self.training_stats[-1])
             
-            self.training_stats.append({
-                'episode': episode,
-                'reward': total_reward,
-                'steps': steps,
-                'success': self.env.cat_pos == self.env.mouse_pos,
-                'exploration': self.agent.exploration_rate
-            })
+            if checkpoint is not None:
+                checkpoint.maybe_save(episode)
+            
+            if profiler is not None:
+                now = clock()
+                if sampled:
+                    profiler.add('stats', now - stats_start)
+                profiler.end_episode(now - episode_start, steps, sampled)
+            
+            if self._check_convergence(max_delta):
+                episodes = episode + 1
+                break
+        
+        if checkpoint is not None:
+            checkpoint.maybe_save(episodes - 1, force=True)
 
-        return self.agent
\ No newline at end of file
+        return self.agent
+    
+    def train_batched(self, episodes=None, num_envs=256, callback=None, checkpoint=None, profiler=None):
+        if episodes is None:
+            episodes = self.config.EPISODES
+        if self.agent.learning_mode != 'q':
+            raise ValueError("Antrenarea in lot foloseste doar actualizarea Q cu un pas")
+        env = BatchedMazeEnvironment(num_envs, self.env.width, self.env.height, self.env.maze_pool,
+                                     self.env.state_encoder, self.env.reward_shaping,
+                                     rng=make_rng(self.seed_sequence.spawn(1)[0]), config=self.config)
+        agent = self.agent
+        get_actions, step, learn_batch, replay = agent.get_actions, env.step, agent.learn_batch, self._replay
+        model = self.model
+        plan = self._plan
+        
+        if profiler is not None:
+            clock = time.perf_counter
+            plain = get_actions, step, learn_batch, replay, plan
+            timed = (profiler.timed('action', get_actions), profiler.timed('step', step),
+                     profiler.timed('learn', learn_batch), profiler.timed('replay', replay),
+                     profiler.timed('plan', plan))
+        
+        states = env.states
+        finished = 0
+        batch = 0
+        
+        while finished < episodes:
+            if profiler is not None:
+                sampled = profiler.sampled(batch)
+                get_actions, step, learn_batch, replay, plan = timed if sampled else plain
+                batch_start = clock()
+            
+            actions = get_actions(states)
+            next_states, rewards, dones = step(actions)
+            learn_batch(states, actions, rewards, next_states, dones)
+            self.env_steps += num_envs
+            
+            if self.replay_buffer is not None:
+                self.replay_buffer.add_batch(states, actions, rewards, next_states, dones)
+                replay(num_envs)
+            
+            if model is not None:
+                model.update_batch(states, actions, rewards, next_states, dones)
+                plan(num_envs)
+            
+            if profiler is not None and sampled:
+                stats_start = clock()
+            finished_before = finished
+            
+            states = env.states
+            finished_slots = np.flatnonzero(dones)
+            max_delta = agent.pop_max_delta() if len(finished_slots) else 0.0
+            
+            for slot in finished_slots:
+                if finished >= episodes:
+                    break
+                
+                total_reward = env.final_rewards[slot]
+                steps = int(env.final_steps[slot])
+                success = bool(env.final_success[slot])
+                
+                agent.record_episode(total_reward, steps)
+                agent.update_exploration_rate()
+                
+                self.training_stats.append(
+                    episode=self.training_stats.count,
+                    reward=total_reward,
+                    steps=steps,
+                    success=success,
+                    exploration=agent.exploration_rate,
+                    max_delta=max_delta
+                )
+                finished += 1
+                
+                if callback is not None:
+                    callback(self.training_stats[-1])
+                
+                if checkpoint is not None:
+                    checkpoint.maybe_save(finished - 1)
+            
+            # un singur max |dQ| acopera toate episoadele terminate la acest pas, deci rabdarea
+            # avanseaza o data pe pas vectorizat, nu o data pe episod
+            if len(finished_slots) and self._check_convergence(max_delta):
+                episodes = finished
+            
+            if profiler is not None:
+                if sampled:
+                    profiler.add('stats', clock() - stats_start)
+                profiler.end_batch(clock() - batch_start, num_envs, finished - finished_before, sampled)
+            batch += 1
+        
+        if checkpoint is not None:
+            checkpoint.maybe_save(finished - 1, force=True)
+        
+        return agent
@@ -0,0 +1,132 @@
+import numpy as np
+from config import Config
+from rng import make_rng
+
+
+class ReplayBuffer:
+    def __init__(self, capacity=Config.REPLAY_CAPACITY, state_dim=2, rng=None):
+        self.capacity = capacity
+        self.rng = make_rng(rng)
+        self.states = np.zeros((capacity, state_dim), dtype=np.intp)
+        self.actions = np.zeros(capacity, dtype=np.intp)
+        self.rewards = np.zeros(capacity)
+        self.next_states = np.zeros((capacity, state_dim), dtype=np.intp)
+        self.dones = np.zeros(capacity, dtype=bool)
+        
+        self.position = 0
+        self.size = 0
+    
+    def __len__(self):
+        return self.size
+    
+    def add(self, state, action, reward, next_state, done):
+        idx = self.position
+        self.states[idx] = state
+        self.actions[idx] = action
+        self.rewards[idx] = reward
+        self.next_states[idx] = next_state
+        self.dones[idx] = done
+        
+        self.position = (idx + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+        self._on_add(np.array([idx]))
+    
+    def add_batch(self, states, actions, rewards, next_states, dones):
+        count = min(len(actions), self.capacity)
+        idx = (self.position + np.arange(count)) % self.capacity
+        
+        self.states[idx] = states[-count:]
+        self.actions[idx] = actions[-count:]
+        self.rewards[idx] = rewards[-count:]
+        self.next_states[idx] = next_states[-count:]
+        self.dones[idx] = dones[-count:]
+        
+        self.position = (self.position + count) % self.capacity
+        self.size = min(self.size + count, self.capacity)
+        self._on_add(idx)
+    
+    def _on_add(self, idx):
+        pass
+    
+    def _batch(self, idx):
+        return self.states[idx], self.actions[idx], self.rewards[idx], self.next_states[idx], self.dones[idx]
+    
+    def sample(self, batch_size):
+        idx = self.rng.integers(0, self.size, batch_size)
+        return self._batch(idx), idx, None
+    
+    def update_priorities(self, idx, td_errors):
+        pass
+
+
+class SumTree:
+    def __init__(self, capacity):
+        self.leaf_start = 1
+        while self.leaf_start < capacity:
+            self.leaf_start *= 2
+        self.depth = self.leaf_start.bit_length() - 1
+        self.tree = np.zeros(2 * self.leaf_start)
+    
+    @property
+    def total(self):
+        return self.tree[1]
+    
+    def get(self, idx):
+        return self.tree[self.leaf_start + idx]
+    
+    def update(self, idx, priorities):
+        nodes = self.leaf_start + np.asarray(idx)
+        self.tree[nodes] = priorities
+        
+        if nodes.size == 1:
+            tree = self.tree
+            node = int(nodes[0]) // 2
+            while node:
+                tree[node] = tree[2 * node] + tree[2 * node + 1]
+                node //= 2
+            return
+        
+        for _ in range(self.depth):
+            nodes = np.unique(nodes // 2)
+            self.tree[nodes] = self.tree[2 * nodes] + self.tree[2 * nodes + 1]
+    
+    def find(self, values):
+        values = np.array(values, dtype=np.float64)
+        nodes = np.ones(len(values), dtype=np.intp)
+        for _ in range(self.depth):
+            left = 2 * nodes
+            left_sum = self.tree[left]
+            go_right = values > left_sum
+            values -= np.where(go_right, left_sum, 0.0)
+            nodes = left + go_right
+        return nodes - self.leaf_start
+
+
+class PrioritizedReplayBuffer(ReplayBuffer):
+    def __init__(self, capacity=Config.REPLAY_CAPACITY, state_dim=2,
+                 alpha=Config.PRIORITY_ALPHA, beta=Config.PRIORITY_BETA, epsilon=1e-3, rng=None):
+        super().__init__(capacity, state_dim, rng)
+        self.alpha = alpha
+        self.beta = beta
+        self.epsilon = epsilon
+        self.max_priority = 1.0
+        self.tree = SumTree(capacity)
+    
+    def _on_add(self, idx):
+        self.tree.update(idx, np.full(len(idx), self.max_priority ** self.alpha))
+    
+    def sample(self, batch_size):
+        total = self.tree.total
+        segment = total / batch_size
+        values = (np.arange(batch_size) + self.rng.random(batch_size)) * segment
+        idx = np.minimum(self.tree.find(np.minimum(values, total)), self.size - 1)
+        
+        probabilities = self.tree.get(idx) / total
+        weights = (self.size * probabilities) ** -self.beta
+        weights /= weights.max()
+        return self._batch(idx), idx, weights
+    
+    def update_priorities(self, idx, td_errors):
+        priorities = np.abs(td_errors) + self.epsilon
+        self.max_priority = max(self.max_priority, float(priorities.max()))
+        self.tree.update(idx, priorities ** self.alpha)
@@ -0,0 +1,32 @@
+import numpy as np
+
+RANDOM_BLOCK_SIZE = 4096
+
+
+def make_rng(seed=None):
+    if isinstance(seed, np.random.Generator):
+        return seed
+    return np.random.default_rng(seed)
+
+
+class RandomStream:
+    def __init__(self, rng, block_size=RANDOM_BLOCK_SIZE):
+        self.rng = rng
+        self.block_size = block_size
+        self._block = []
+    
+    def _refill(self):
+        block = self.rng.random(self.block_size).tolist()
+        block.reverse()
+        self._block = block
+    
+    def random(self):
+        if not self._block:
+            self._refill()
+        return self._block.pop()
+    
+    def integers(self, high):
+        return int(self.random() * high)
+    
+    def choice(self, options):
+        return options[int(self.random() * len(options))]
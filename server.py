@@ -0,0 +1,207 @@
+import asyncio
+import json
+import os
+import signal
+import sys
+import threading
+import numpy as np
+from checkpoint import META_FILE, load_checkpoint
+
+
+class PolicyModel:
+    def __init__(self, agent, version=0):
+        self.state_space_size = agent.state_space_size
+        self.action_space_size = agent.action_space_size
+        self.version = version
+        
+        if agent.q_backend == 'sparse':
+            # tabela rara ramane rara: cheile sortate se cauta binar, iar starile nevizitate
+            # primesc un rand final cu valori Q nule
+            keys, values = agent.q_table.to_arrays()
+            if len(keys) != len(values):
+                raise ValueError(f"Checkpoint incoerent: {len(keys)} chei pentru {len(values)} randuri Q")
+            order = np.argsort(keys)
+            self.keys = np.ascontiguousarray(keys[order])
+            table = np.vstack([values[order], np.zeros((1, self.action_space_size))])
+        else:
+            self.keys = None
+            table = np.asarray(agent.q_table).reshape(-1, self.action_space_size)
+        self.q_values = np.ascontiguousarray(table)
+        self.actions = np.argmax(self.q_values, axis=1)
+        self._limits = np.array(self.state_space_size)
+    
+    def _lookup(self, flat):
+        keys = self.keys
+        unseen = len(keys)
+        if not unseen:
+            return np.full(len(flat), unseen, dtype=np.intp)
+        positions = np.minimum(np.searchsorted(keys, flat), unseen - 1)
+        return np.where(keys[positions] == flat, positions, unseen)
+    
+    def rows(self, states):
+        states = np.asarray(states, dtype=np.int64).reshape(-1, len(self.state_space_size))
+        valid = ((states >= 0) & (states < self._limits)).all(axis=1)
+        rows = np.zeros(len(states), dtype=np.intp)
+        if valid.any():
+            flat = np.ravel_multi_index(tuple(states[valid].T), self.state_space_size)
+            rows[valid] = flat if self.keys is None else self._lookup(flat)
+        return rows, valid
+
+
+class PolicyServer:
+    def __init__(self, checkpoint_path, max_batch=1024, max_delay=0.0, reload_interval=1.0):
+        self.checkpoint_path = checkpoint_path
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.reload_interval = reload_interval
+        
+        self.model = None
+        self._checkpoint_mtime = None
+        self.reloads = 0
+        self.requests = 0
+        self.batches = 0
+        self.connections = 0
+        self._queue = None
+        self._server = None
+        self._reload_lock = threading.Lock()
+        self.load()
+    
+    def _meta_mtime(self):
+        return os.stat(os.path.join(self.checkpoint_path, META_FILE)).st_mtime_ns
+    
+    def load(self):
+        mtime = self._meta_mtime()
+        agent = load_checkpoint(self.checkpoint_path, mmap=True)
+        # modelul se inlocuieste printr-o singura atribuire; cererile in curs folosesc modelul vechi
+        self.model = PolicyModel(agent, version=self.reloads)
+        self._checkpoint_mtime = mtime
+        self.reloads += 1
+    
+    def reload(self, force=False):
+        # ruleaza in executor; lacatul serializeaza reincarcarile din watcher si din SIGHUP
+        with self._reload_lock:
+            try:
+                if force or self._meta_mtime() != self._checkpoint_mtime:
+                    self.load()
+            except (OSError, ValueError, KeyError):
+                # checkpoint in curs de scriere sau invalid: se incearca din nou la urmatorul interval
+                pass
+    
+    async def _watch_checkpoint(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            try:
+                changed = self._meta_mtime() != self._checkpoint_mtime
+            except OSError:
+                continue
+            if changed:
+                try:
+                    await loop.run_in_executor(None, self.reload)
+                except Exception as error:
+                    # o eroare neprevazuta nu opreste urmarirea checkpoint-ului; modelul vechi ramane activ
+                    print(f"Reincarcare esuata: {error!r}", file=sys.stderr)
+    
+    async def _batch_requests(self):
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            # o cedare a buclei lasa conexiunile cu date deja sosite sa-si adauge cererile in lot
+            await asyncio.sleep(self.max_delay if queue.empty() else 0)
+            while len(batch) < self.max_batch and not queue.empty():
+                batch.append(queue.get_nowait())
+            self._answer_batch(batch)
+    
+    def _answer_batch(self, batch):
+        model = self.model
+        rows, valid = model.rows([request['state'] for request, _ in batch if request is not None])
+        actions = model.actions[rows].tolist()
+        
+        i = 0
+        for request, writer in batch:
+            if request is None:
+                # conexiunea s-a inchis dupa cererile de dinaintea ei din coada
+                writer.close()
+                continue
+            if not valid[i]:
+                response = {'error': f"Stare invalida: {request['state']}"}
+            else:
+                response = {'action': actions[i], 'version': model.version}
+                if request.get('q'):
+                    response['q_values'] = model.q_values[rows[i]].tolist()
+            self._write(writer, request, response)
+            i += 1
+        
+        self.requests += i
+        self.batches += 1
+    
+    def _write(self, writer, request, response):
+        if 'id' in request:
+            response['id'] = request['id']
+        if not writer.is_closing():
+            writer.write(json.dumps(response).encode('utf-8') + b'\n')
+    
+    def _valid_state(self, state):
+        return (isinstance(state, list) and len(state) == len(self.model.state_space_size)
+                and all(type(value) is int for value in state))
+    
+    def info(self):
+        model = self.model
+        return {
+            'state_space_size': list(model.state_space_size),
+            'action_space_size': model.action_space_size,
+            'version': model.version,
+            'requests': self.requests,
+            'batches': self.batches,
+            'connections': self.connections,
+        }
+    
+    async def _handle_connection(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    writer.write(b'{"error": "JSON invalid"}\n')
+                    continue
+                
+                # raspunsurile sunt scrise de lot, in ordinea gruparii; clientul le asociaza dupa id
+                if not isinstance(request, dict):
+                    writer.write(b'{"error": "Cerere invalida"}\n')
+                elif request.get('op') == 'info':
+                    self._write(writer, request, self.info())
+                elif not self._valid_state(request.get('state')):
+                    self._write(writer, request, {'error': f"Stare invalida: {request.get('state')}"})
+                else:
+                    self._queue.put_nowait((request, writer))
+                
+                if writer.transport.get_write_buffer_size() > 1 << 20:
+                    await writer.drain()
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.connections -= 1
+            self._queue.put_nowait((None, writer))
+    
+    async def start(self, host='127.0.0.1', port=8765, unix_path=None):
+        self._queue = asyncio.Queue()
+        if unix_path:
+            self._server = await asyncio.start_unix_server(self._handle_connection, path=unix_path)
+        else:
+            self._server = await asyncio.start_server(self._handle_connection, host, port)
+        self._tasks = [asyncio.create_task(self._batch_requests()),
+                       asyncio.create_task(self._watch_checkpoint())]
+        return self._server
+    
+    async def serve_forever(self, host='127.0.0.1', port=8765, unix_path=None):
+        server = await self.start(host, port, unix_path)
+        if hasattr(signal, 'SIGHUP'):
+            loop = asyncio.get_running_loop()
+            loop.add_signal_handler(signal.SIGHUP, loop.run_in_executor, None, self.reload, True)
+        async with server:
+            await server.serve_forever()
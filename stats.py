@@ -0,0 +1,156 @@
+import numpy as np
+
+TRAINING_COLUMNS = (
+    ('episode', np.int64),
+    ('reward', np.float64),
+    ('steps', np.int32),
+    ('success', np.bool_),
+    ('exploration', np.float64),
+    ('max_delta', np.float64),
+)
+
+HISTORY_COLUMNS = (
+    ('reward', np.float64),
+    ('steps', np.int32),
+    ('exploration', np.float64),
+)
+
+
+class ColumnStore:
+    def __init__(self, columns, capacity=1024, ring_size=0):
+        self.columns = tuple(name for name, _ in columns)
+        self.dtypes = dict(columns)
+        self.ring_size = ring_size
+        
+        size = ring_size if ring_size else capacity
+        self._data = {name: np.zeros(size, dtype=dtype) for name, dtype in columns}
+        self.count = 0
+        
+        self.totals = {name: 0.0 for name in self.columns}
+        self.minimums = {name: np.inf for name in self.columns}
+        self.maximums = {name: -np.inf for name in self.columns}
+    
+    def __len__(self):
+        if self.ring_size:
+            return min(self.count, self.ring_size)
+        return self.count
+    
+    @property
+    def capacity(self):
+        return len(self._data[self.columns[0]])
+    
+    def _grow(self, needed):
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        for name in self.columns:
+            grown = np.zeros(capacity, dtype=self.dtypes[name])
+            grown[:self.count] = self._data[name][:self.count]
+            self._data[name] = grown
+    
+    def append(self, **values):
+        if self.ring_size:
+            idx = self.count % self.ring_size
+        else:
+            if self.count >= self.capacity:
+                self._grow(self.count + 1)
+            idx = self.count
+        
+        for name in self.columns:
+            value = values[name]
+            self._data[name][idx] = value
+            self.totals[name] += value
+            if value < self.minimums[name]:
+                self.minimums[name] = value
+            if value > self.maximums[name]:
+                self.maximums[name] = value
+        
+        self.count += 1
+    
+    def extend(self, **columns):
+        arrays = {name: np.asarray(columns[name]) for name in self.columns}
+        size = len(arrays[self.columns[0]])
+        if size == 0:
+            return
+        
+        for name, values in arrays.items():
+            self.totals[name] += float(values.sum())
+            self.minimums[name] = min(self.minimums[name], values.min())
+            self.maximums[name] = max(self.maximums[name], values.max())
+        
+        if not self.ring_size:
+            self._grow(self.count + size)
+            for name, values in arrays.items():
+                self._data[name][self.count:self.count + size] = values
+        else:
+            keep = min(size, self.ring_size)
+            positions = (self.count + size - keep + np.arange(keep)) % self.ring_size
+            for name, values in arrays.items():
+                self._data[name][positions] = values[-keep:]
+        
+        self.count += size
+    
+    def column(self, name):
+        data = self._data[name]
+        if not self.ring_size:
+            return data[:self.count]
+        if self.count <= self.ring_size:
+            return data[:self.count]
+        start = self.count % self.ring_size
+        return np.concatenate((data[start:], data[:start]))
+    
+    def row(self, index):
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError(index)
+        
+        if self.ring_size and self.count > self.ring_size:
+            index = (self.count + index) % self.ring_size
+        return {name: self._data[name][index].item() for name in self.columns}
+    
+    def last(self, name):
+        index = (self.count - 1) % self.ring_size if self.ring_size else self.count - 1
+        return self._data[name][index]
+    
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self.column(key)
+        return self.row(key)
+    
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self.row(index)
+    
+    def mean(self, name):
+        return self.totals[name] / self.count if self.count else 0.0
+    
+    def summary(self):
+        summary = {'count': self.count}
+        for name in self.columns:
+            summary[f'{name}_mean'] = self.mean(name)
+            summary[f'{name}_min'] = self.minimums[name] if self.count else 0
+            summary[f'{name}_max'] = self.maximums[name] if self.count else 0
+        return summary
+    
+    def to_dict(self):
+        return {name: self.column(name) for name in self.columns}
+    
+    def save_npz(self, path):
+        np.savez_compressed(path, **self.to_dict())
+    
+    def save_csv(self, path):
+        data = np.column_stack([self.column(name).astype(np.float64) for name in self.columns])
+        fmt = ['%.6g' if np.issubdtype(self.dtypes[name], np.floating) else '%d' for name in self.columns]
+        np.savetxt(path, data, fmt=fmt, delimiter=',', header=','.join(self.columns), comments='')
+
+
+class TrainingStats(ColumnStore):
+    def __init__(self, ring_size=0, columns=TRAINING_COLUMNS):
+        super().__init__(columns, ring_size=ring_size)
+
+
+class EpisodeHistory(ColumnStore):
+    def __init__(self, ring_size=0):
+        super().__init__(HISTORY_COLUMNS, ring_size=ring_size)
@@ -0,0 +1,131 @@
+import csv
+import itertools
+import multiprocessing as mp
+import time
+import numpy as np
+from config import Config, DEFAULT_CONFIG, parse_value
+from q_learning import QLearningTrainer
+
+
+def parse_space(specs):
+    space = {}
+    for spec in specs:
+        name, _, values = spec.partition('=')
+        name = name.strip().upper()
+        if not hasattr(Config, name):
+            raise AttributeError(f"Parametru de configurare necunoscut: {name}")
+        
+        if ':' in values:
+            low, high = values.split(':', 1)
+            space[name] = (float(low), float(high))
+        else:
+            space[name] = [parse_value(value.strip(), name) for value in values.split(',')]
+    return space
+
+
+def grid_search(space):
+    names = sorted(space)
+    for name in names:
+        if isinstance(space[name], tuple):
+            raise ValueError(f"Cautarea pe grila necesita valori discrete pentru {name}")
+    return [dict(zip(names, values)) for values in itertools.product(*(space[name] for name in names))]
+
+
+def random_search(space, trials, seed=None):
+    rng = np.random.default_rng(seed)
+    names = sorted(space)
+    
+    samples = []
+    for _ in range(trials):
+        params = {}
+        for name in names:
+            values = space[name]
+            if isinstance(values, tuple):
+                params[name] = float(rng.uniform(*values))
+            else:
+                params[name] = values[int(rng.integers(len(values)))]
+        samples.append(params)
+    return samples
+
+
+def rolling_success(stats, window):
+    recent = stats['success'][-window:]
+    return float(recent.mean()) if len(recent) else 0.0
+
+
+def _run_trial(args):
+    trial_id, config, trainer, episodes, seed, window = args
+    
+    start = time.perf_counter()
+    if trainer is None:
+        trainer = QLearningTrainer(seed=seed, config=config)
+    trainer.train(episodes)
+    
+    return trial_id, trainer, rolling_success(trainer.training_stats, window), time.perf_counter() - start
+
+
+class SweepRunner:
+    def __init__(self, trials, workers=None, min_episodes=100, eta=3, rungs=3, window=100, seed=0,
+                 config=DEFAULT_CONFIG):
+        self.trials = trials
+        self.config = config
+        self.workers = workers or mp.cpu_count()
+        self.min_episodes = min_episodes
+        self.eta = eta
+        self.rungs = rungs
+        self.window = window
+        self.seed = seed
+        self.results = []
+    
+    def run(self):
+        seeds = np.random.SeedSequence(self.seed).spawn(len(self.trials))
+        configs = [self.config.replace(**params) for params in self.trials]
+        results = {
+            trial_id: dict(trial=trial_id, rung=0, episodes=0, score=0.0, seconds=0.0, **params)
+            for trial_id, params in enumerate(self.trials)
+        }
+        trainers = {}
+        alive = list(range(len(self.trials)))
+        trained = 0
+        
+        with mp.Pool(self.workers) as pool:
+            for rung in range(self.rungs):
+                budget = self.min_episodes * self.eta ** rung
+                jobs = [(trial_id, configs[trial_id], trainers.get(trial_id), budget - trained,
+                         seeds[trial_id], self.window) for trial_id in alive]
+                
+                for trial_id, trainer, score, seconds in pool.imap_unordered(_run_trial, jobs):
+                    trainers[trial_id] = trainer
+                    row = results[trial_id]
+                    row.update(rung=rung, episodes=budget, score=score, seconds=row['seconds'] + seconds)
+                
+                trained = budget
+                if rung == self.rungs - 1:
+                    break
+                
+                # successive halving: pastreaza cele mai bune 1/eta incercari
+                keep = max(1, len(alive) // self.eta)
+                ranked = sorted(alive, key=lambda trial_id: (-results[trial_id]['score'], trial_id))
+                alive = ranked[:keep]
+                for trial_id in ranked[keep:]:
+                    del trainers[trial_id]
+        
+        self.results = sorted(results.values(), key=lambda row: (-row['rung'], -row['score'], row['trial']))
+        return self.results
+    
+    def save_csv(self, path):
+        names = ['trial', 'rung', 'episodes', 'score', 'seconds']
+        params = sorted({key for row in self.results for key in row} - set(names))
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=names + params)
+            writer.writeheader()
+            writer.writerows(self.results)
+
+
+def print_results(results, limit=10):
+    for row in results[:limit]:
+        params = ', '.join(f"{key}={value:.4g}" if isinstance(value, float) else f"{key}={value}"
+                           for key, value in row.items()
+                           if key not in ('trial', 'rung', 'episodes', 'score', 'seconds'))
+        print(f"#{row['trial']:<3} treapta {row['rung']} episoade {row['episodes']:<5} "
+              f"succes {row['score'] * 100:5.1f}%  {row['seconds']:6.2f}s  {params}")
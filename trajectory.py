@@ -0,0 +1,182 @@
+import json
+import os
+import numpy as np
+from background import TrainingSnapshot
+
+TRAJECTORY_VERSION = 2
+
+META_FILE = 'meta.json'
+INDEX_FILE = 'index.bin'
+STEPS_FILE = 'steps.bin'
+MAZES_FILE = 'mazes.bin'
+
+# celulele sunt indici y * latime + x; versiunea 1 le stoca pe 16 biti (maxim 65535 de celule)
+STEP_DTYPE = np.dtype([
+    ('cat', '<u4'),
+    ('mouse', '<u4'),
+    ('action', 'i1'),
+    ('reward', '<f4'),
+])
+
+INDEX_DTYPE = np.dtype([
+    ('episode', '<i8'),
+    ('step_offset', '<i8'),
+    ('maze_offset', '<i8'),
+    ('length', '<i4'),
+    ('height', '<i2'),
+    ('width', '<i2'),
+    ('success', 'u1'),
+    ('total_reward', '<f4'),
+    ('exploration', '<f4'),
+])
+
+
+class TrajectoryRecorder:
+    def __init__(self, path, flush_every=256):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.flush_every = flush_every
+        
+        meta_path = os.path.join(path, META_FILE)
+        if os.path.exists(meta_path):
+            with open(meta_path, encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta.get('version') != TRAJECTORY_VERSION:
+                raise ValueError(f"Jurnalul din {path} are versiunea {meta.get('version')}; "
+                                 f"se poate continua doar un jurnal de versiunea {TRAJECTORY_VERSION}")
+        else:
+            with open(meta_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': TRAJECTORY_VERSION, 'step_dtype': STEP_DTYPE.descr,
+                           'index_dtype': INDEX_DTYPE.descr}, f, indent=2)
+        
+        self._steps_file = open(os.path.join(path, STEPS_FILE), 'ab')
+        self._mazes_file = open(os.path.join(path, MAZES_FILE), 'ab')
+        self._index_file = open(os.path.join(path, INDEX_FILE), 'ab')
+        self._step_offset = self._steps_file.tell() // STEP_DTYPE.itemsize
+        self._maze_offset = self._mazes_file.tell()
+        # numerotarea episoadelor unei rulari incepe de la 0; la continuarea unui jurnal se decaleaza
+        # cu episoadele deja scrise, ca indexul sa nu contina id-uri duplicate
+        self._episode_offset = self._index_file.tell() // INDEX_DTYPE.itemsize
+        
+        self._records = []
+        self._append = self._records.append
+        self._mazes = []
+        self._index = []
+        self._episode_start = 0
+        self.episodes = 0
+    
+    def start_episode(self, env):
+        self._episode_start = len(self._records)
+        self._append((env._cat_cell, env._mouse_cell, -1, 0.0))
+        self._mazes.append(env.maze.tobytes())
+    
+    def record_step(self, env, action, reward):
+        self._append((env._cat_cell, env._mouse_cell, action, reward))
+    
+    def end_episode(self, env, stats):
+        length = len(self._records) - self._episode_start
+        self._index.append((self._episode_offset + stats.last('episode'), self._step_offset + self._episode_start, self._maze_offset,
+                            length, env.height, env.width, stats.last('success'), stats.last('reward'),
+                            stats.last('exploration')))
+        self._maze_offset += env.maze.size
+        
+        self.episodes += 1
+        if len(self._index) >= self.flush_every:
+            self.flush()
+    
+    def flush(self):
+        if not self._index:
+            return
+        
+        steps = np.empty(len(self._records), dtype=STEP_DTYPE)
+        steps['cat'], steps['mouse'], steps['action'], steps['reward'] = zip(*self._records)
+        self._steps_file.write(steps.tobytes())
+        self._mazes_file.write(b''.join(self._mazes))
+        self._steps_file.flush()
+        self._mazes_file.flush()
+        
+        # indexul se scrie ultimul: un cititor vede doar episoade complete
+        self._index_file.write(np.array(self._index, dtype=INDEX_DTYPE).tobytes())
+        self._index_file.flush()
+        
+        self._step_offset += len(steps)
+        self._records.clear()
+        self._mazes = []
+        self._index = []
+    
+    def close(self):
+        self.flush()
+        self._steps_file.close()
+        self._mazes_file.close()
+        self._index_file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _map(path, dtype):
+    if not os.path.exists(path) or os.path.getsize(path) < dtype.itemsize:
+        return np.zeros(0, dtype=dtype)
+    count = os.path.getsize(path) // dtype.itemsize
+    return np.memmap(path, dtype=dtype, mode='r', shape=(count,))
+
+
+class TrajectoryLog:
+    def __init__(self, path):
+        with open(os.path.join(path, META_FILE), encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('version') not in (1, TRAJECTORY_VERSION):
+            raise ValueError(f"Versiune jurnal de traiectorii nesuportata: {meta.get('version')}")
+        
+        self.path = path
+        self.step_dtype = np.dtype([tuple(field) for field in meta['step_dtype']])
+        self.refresh()
+    
+    def refresh(self):
+        self.index = _map(os.path.join(self.path, INDEX_FILE), INDEX_DTYPE)
+        self.steps = _map(os.path.join(self.path, STEPS_FILE), self.step_dtype)
+        self.mazes = _map(os.path.join(self.path, MAZES_FILE), np.dtype(np.int8))
+        return len(self.index)
+    
+    def __len__(self):
+        return len(self.index)
+    
+    def maze(self, i):
+        entry = self.index[i]
+        size = int(entry['height']) * int(entry['width'])
+        offset = int(entry['maze_offset'])
+        return self.mazes[offset:offset + size].reshape(entry['height'], entry['width'])
+    
+    def episode_steps(self, i):
+        entry = self.index[i]
+        offset = int(entry['step_offset'])
+        return self.steps[offset:offset + int(entry['length'])]
+    
+    def paths(self, i):
+        steps = self.episode_steps(i)
+        width = int(self.index[i]['width'])
+        cat_y, cat_x = np.divmod(steps['cat'].astype(np.intp), width)
+        mouse_y, mouse_x = np.divmod(steps['mouse'].astype(np.intp), width)
+        return (list(zip(cat_y.tolist(), cat_x.tolist())),
+                list(zip(mouse_y.tolist(), mouse_x.tolist())))
+    
+    def snapshot(self, i):
+        entry = self.index[i]
+        upto = self.index[:i + 1]
+        cat_path, mouse_path = self.paths(i)
+        return TrainingSnapshot(
+            episode=int(entry['episode']),
+            maze=np.array(self.maze(i)),
+            cat_path=tuple(cat_path),
+            mouse_path=tuple(mouse_path),
+            rewards=tuple(self.episode_steps(i)['reward'].tolist()),
+            exploration_rate=float(entry['exploration']),
+            success=bool(entry['success']),
+            episodes_done=int(entry['episode']) + 1,
+            success_count=int(upto['success'].sum()),
+            total_score=float(upto['total_reward'].sum()),
+            best_score=float(upto['total_reward'].max()),
+        )
@@ -1,19 +1,56 @@
+import time
+from collections import deque
 import pygame
 import numpy as np
-from config import Config
+from config import DEFAULT_CONFIG
+
+TEXT_CACHE_LIMIT = 512
+# statisticile de randare folosesc doar ultimele cadre
+FRAME_TIMES_LIMIT = 4096
+
+# tastele de navigare in modul de reluare: salt relativ in jurnal
+SEEK_KEYS = {
+    pygame.K_RIGHT: 1,
+    pygame.K_LEFT: -1,
+    pygame.K_PAGEUP: 100,
+    pygame.K_PAGEDOWN: -100,
+}
+
+
+class EpisodeView:
+    def __init__(self, maze, exploration_rate=0.0):
+        self.maze = maze
+        self.height, self.width = maze.shape
+        self.cat_pos = (0, 0)
+        self.mouse_pos = (0, 0)
+        self.steps = 0
+        self.total_reward = 0.0
+        self.exploration_rate = exploration_rate
+
 
 class MazeVisualizer:
-    def __init__(self, env, agent):
+    def __init__(self, env, agent, config=None, offscreen=False):
         self.env = env
         self.agent = agent
-        
-        self.panel_height = 180 
-        self.screen_width = Config.SCREEN_WIDTH  
-        self.screen_height = Config.SCREEN_HEIGHT  
-        
-        pygame.init()
-        self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
-        pygame.display.set_caption("Tom & Jerry - Q-Learning")
+        self.config = config or env.config
+        self.cell_size = self.config.CELL_SIZE
+        self.fps = self.config.FPS
+        self.max_steps = self.config.MAX_STEPS_PER_EPISODE
+        
+        self.panel_height = self.config.PANEL_HEIGHT
+        self.panel_y = env.height * self.cell_size
+        self.screen_width = env.width * self.cell_size
+        self.screen_height = self.panel_y + self.panel_height
+        
+        # fara fereastra: se deseneaza intr-o suprafata din memorie, fara driver video
+        self.offscreen = offscreen
+        if offscreen:
+            pygame.font.init()
+            self.screen = pygame.Surface((self.screen_width, self.screen_height), 0, 32)
+        else:
+            pygame.init()
+            self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
+            pygame.display.set_caption("Tom & Jerry - Q-Learning")
         
         self.clock = pygame.time.Clock()
         self.small_font = pygame.font.SysFont('Arial', 16)  
@@ -29,13 +66,24 @@ class MazeVisualizer:
         self.current_episode_score = 0.0
         self.success_count = 0
         
-        self.panel_y = Config.MAZE_HEIGHT * Config.CELL_SIZE
-        
         col_width = self.screen_width // 3
         
         self.col1_x = 15
         self.col2_x = col_width + 15
         self.col3_x = 2 * col_width + 15
+        
+        self.panel_rect = pygame.Rect(0, self.panel_y, self.screen_width, self.panel_height)
+        self.background = None
+        self._background_maze = None
+        self._text_cache = {}
+        self.full_redraw = True
+        self.frame_times = deque(maxlen=FRAME_TIMES_LIMIT)
+        self.seekable = False
+        self.seek_delta = None
+        
+        self.pause_overlay = self._make_overlay((0, 0, 0, 160))
+        self.result_overlay = self._make_overlay((0, 0, 0, 180))
+        self.final_overlay = self._make_overlay((0, 0, 60, 220))
     
     def update_score(self, episode_reward, success):
         self.current_episode_score = episode_reward
@@ -47,56 +95,91 @@ class MazeVisualizer:
         if success:
             self.success_count += 1
     
-    def draw_maze(self):
-        self.screen.fill(Config.BACKGROUND)
+    def _make_overlay(self, color):
+        overlay = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
+        overlay.fill(color)
+        return overlay
+    
+    def render_text(self, font, text, color):
+        key = (id(font), text, color)
+        surface = self._text_cache.get(key)
+        if surface is None:
+            if len(self._text_cache) >= TEXT_CACHE_LIMIT:
+                self._text_cache.clear()
+            surface = font.render(text, True, color)
+            self._text_cache[key] = surface
+        return surface
+    
+    def cell_rect(self, pos):
+        y, x = pos
+        return pygame.Rect(x * self.cell_size, y * self.cell_size, self.cell_size, self.cell_size)
+    
+    def render_background(self):
+        self.background = pygame.Surface((self.screen_width, self.panel_y))
+        self.background.fill(self.config.BACKGROUND)
         
         for y in range(self.env.height):
             for x in range(self.env.width):
-                center_x = x * Config.CELL_SIZE + Config.CELL_SIZE // 2
-                center_y = y * Config.CELL_SIZE + Config.CELL_SIZE // 2
-                radius = Config.CELL_SIZE // 2.8
+                center_x = x * self.cell_size + self.cell_size // 2
+                center_y = y * self.cell_size + self.cell_size // 2
+                radius = self.cell_size // 2.8
                 
                 if self.env.maze[y][x] == 1:
-                    pygame.draw.circle(self.screen, Config.WALL, (center_x, center_y), radius)
+                    pygame.draw.circle(self.background, self.config.WALL, (center_x, center_y), radius)
                 else:
-                    pygame.draw.circle(self.screen, Config.EMPTY, (center_x, center_y), radius)
-                    pygame.draw.circle(self.screen, Config.GRID, (center_x, center_y), radius, 2)
+                    pygame.draw.circle(self.background, self.config.EMPTY, (center_x, center_y), radius)
+                    pygame.draw.circle(self.background, self.config.GRID, (center_x, center_y), radius, 2)
+        
+        self._background_maze = self.env.maze
+        self.full_redraw = True
+    
+    def frame_cells(self):
+        return {tuple(self.env.cat_pos), tuple(self.env.mouse_pos), *self.path[-10:]}
+    
+    def draw_maze(self, cells=None):
+        if self.background is None or self._background_maze is not self.env.maze:
+            self.render_background()
+        
+        if cells is None:
+            self.screen.fill(self.config.BACKGROUND)
+            self.screen.blit(self.background, (0, 0))
+        else:
+            for cell in cells:
+                rect = self.cell_rect(cell)
+                self.screen.blit(self.background, rect, rect)
         
         for i, (pos_y, pos_x) in enumerate(self.path[-10:]):
-            alpha = 150
-            color = (*Config.PATH[:3], alpha) if len(Config.PATH) > 3 else (*Config.PATH, alpha)
-            
-            center_x = pos_x * Config.CELL_SIZE + Config.CELL_SIZE // 2
-            center_y = pos_y * Config.CELL_SIZE + Config.CELL_SIZE // 2
-            trail_radius = Config.CELL_SIZE // 8
+            center_x = pos_x * self.cell_size + self.cell_size // 2
+            center_y = pos_y * self.cell_size + self.cell_size // 2
+            trail_radius = self.cell_size // 8
             
-            pygame.draw.circle(self.screen, color[:3], (center_x, center_y), trail_radius)
+            pygame.draw.circle(self.screen, self.config.PATH[:3], (center_x, center_y), trail_radius)
     
     def draw_agents(self):
         mouse_x, mouse_y = self.env.mouse_pos[1], self.env.mouse_pos[0]
-        mouse_center_x = mouse_x * Config.CELL_SIZE + Config.CELL_SIZE // 2
-        mouse_center_y = mouse_y * Config.CELL_SIZE + Config.CELL_SIZE // 2
-        mouse_radius = Config.CELL_SIZE // 2.8
+        mouse_center_x = mouse_x * self.cell_size + self.cell_size // 2
+        mouse_center_y = mouse_y * self.cell_size + self.cell_size // 2
+        mouse_radius = self.cell_size // 2.8
         
-        pygame.draw.circle(self.screen, Config.MOUSE, (mouse_center_x, mouse_center_y), mouse_radius)
+        pygame.draw.circle(self.screen, self.config.MOUSE, (mouse_center_x, mouse_center_y), mouse_radius)
         
-        mouse_text = self.small_font.render("J", True, (255, 255, 255))
+        mouse_text = self.render_text(self.small_font, "J", (255, 255, 255))
         mouse_text_rect = mouse_text.get_rect(center=(mouse_center_x, mouse_center_y))
         self.screen.blit(mouse_text, mouse_text_rect)
         
         cat_x, cat_y = self.env.cat_pos[1], self.env.cat_pos[0]
-        cat_center_x = cat_x * Config.CELL_SIZE + Config.CELL_SIZE // 2
-        cat_center_y = cat_y * Config.CELL_SIZE + Config.CELL_SIZE // 2
-        cat_radius = Config.CELL_SIZE // 2.8
+        cat_center_x = cat_x * self.cell_size + self.cell_size // 2
+        cat_center_y = cat_y * self.cell_size + self.cell_size // 2
+        cat_radius = self.cell_size // 2.8
         
-        pygame.draw.circle(self.screen, Config.CAT, (cat_center_x, cat_center_y), cat_radius)
+        pygame.draw.circle(self.screen, self.config.CAT, (cat_center_x, cat_center_y), cat_radius)
         
-        cat_text = self.small_font.render("T", True, (255, 255, 255))
+        cat_text = self.render_text(self.small_font, "T", (255, 255, 255))
         cat_text_rect = cat_text.get_rect(center=(cat_center_x, cat_center_y))
         self.screen.blit(cat_text, cat_text_rect)
     
     def draw_score_panel(self):
-        pygame.draw.rect(self.screen, Config.PANEL, 
+        pygame.draw.rect(self.screen, self.config.PANEL, 
                         (0, self.panel_y, self.screen_width, self.panel_height))
         
         pygame.draw.line(self.screen, (120, 120, 120), 
@@ -104,42 +187,40 @@ class MazeVisualizer:
         
         row_height = 30
         
-        ep_text = self.small_font.render(f"Episod: {self.episode_count}", True, (0, 0, 150))
+        ep_text = self.render_text(self.small_font, f"Episod: {self.episode_count}", (0, 0, 150))
         self.screen.blit(ep_text, (self.col1_x, self.panel_y + 20))
         
-        steps_text = self.small_font.render(f"Pasi: {self.env.steps}", True, (30, 30, 30))
+        steps_text = self.render_text(self.small_font, f"Pasi: {self.env.steps}", (30, 30, 30))
         self.screen.blit(steps_text, (self.col1_x, self.panel_y + 20 + row_height))
         
-        reward_text = self.small_font.render(f"Recompensa: {self.env.total_reward:.1f}", True, (30, 30, 30))
+        reward_text = self.render_text(self.small_font, f"Recompensa: {self.env.total_reward:.1f}", (30, 30, 30))
         self.screen.blit(reward_text, (self.col1_x, self.panel_y + 20 + 2*row_height))
 
         success_rate = (self.success_count / self.episode_count * 100) if self.episode_count > 0 else 0
-        success_text = self.small_font.render(f"Succes: {success_rate:.1f}%", True, (0, 120, 0))
+        success_text = self.render_text(self.small_font, f"Succes: {success_rate:.1f}%", (0, 120, 0))
         self.screen.blit(success_text, (self.col2_x, self.panel_y + 20))
         
-        explore_text = self.small_font.render(f"Explorare: {self.agent.exploration_rate:.3f}", True, (120, 0, 120))
+        explore_text = self.render_text(self.small_font, f"Explorare: {self.agent.exploration_rate:.3f}", (120, 0, 120))
         self.screen.blit(explore_text, (self.col2_x, self.panel_y + 20 + row_height))
         
-        success_count_text = self.small_font.render(f"Total succes: {self.success_count}", True, (0, 100, 0))
+        success_count_text = self.render_text(self.small_font, f"Total succes: {self.success_count}", (0, 100, 0))
         self.screen.blit(success_count_text, (self.col2_x, self.panel_y + 20 + 2*row_height))
         
-        score_text = self.small_font.render(f"Scor episod: {self.env.total_reward:.1f}", True, (180, 0, 0))
+        score_text = self.render_text(self.small_font, f"Scor episod: {self.env.total_reward:.1f}", (180, 0, 0))
         self.screen.blit(score_text, (self.col3_x, self.panel_y + 20))
         
-        record_text = self.small_font.render(f"Record: {self.best_score:.1f}", True, (180, 140, 0))
+        record_text = self.render_text(self.small_font, f"Record: {self.best_score:.1f}", (180, 140, 0))
         self.screen.blit(record_text, (self.col3_x, self.panel_y + 20 + row_height))
         
-        total_text = self.small_font.render(f"Total: {self.total_score:.1f}", True, (0, 100, 180))
+        total_text = self.render_text(self.small_font, f"Total: {self.total_score:.1f}", (0, 100, 180))
         self.screen.blit(total_text, (self.col3_x, self.panel_y + 20 + 2*row_height))
         
     
     def draw_pause_indicator(self):
         if self.paused:
-            overlay = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 160))
-            self.screen.blit(overlay, (0, 0))
+            self.screen.blit(self.pause_overlay, (0, 0))
             
-            pause_text = self.small_font.render("PAUZA (SPACE pentru a continua)", True, (255, 255, 100))
+            pause_text = self.render_text(self.small_font, "PAUZA (SPACE pentru a continua)", (255, 255, 100))
             text_rect = pause_text.get_rect(center=(self.screen_width//2, self.screen_height//2))
             self.screen.blit(pause_text, text_rect)
     
@@ -152,9 +233,12 @@ class MazeVisualizer:
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_SPACE:
                     self.paused = not self.paused
+                    self.full_redraw = True
                 elif event.key == pygame.K_ESCAPE:
                     self.running = False
                     return False
+                elif self.seekable and event.key in SEEK_KEYS:
+                    self.seek_delta = SEEK_KEYS[event.key]
         
         return True
     
@@ -163,17 +247,44 @@ class MazeVisualizer:
         if len(self.path) > 15:
             self.path.pop(0)
     
-    def run_episode(self):
+    def draw_frame(self, previous_cells):
+        frame_start = time.perf_counter()
+        cells = self.frame_cells()
+        
+        if self.full_redraw or self.paused:
+            self.draw_maze()
+        else:
+            self.draw_maze(previous_cells | cells)
+        self.draw_agents()
+        self.draw_score_panel()
+        self.draw_pause_indicator()
+        
+        if self.offscreen:
+            self.full_redraw = False
+        elif self.full_redraw or self.paused:
+            pygame.display.flip()
+            self.full_redraw = self.paused
+        else:
+            dirty_rects = [self.cell_rect(cell) for cell in previous_cells | cells]
+            dirty_rects.append(self.panel_rect)
+            pygame.display.update(dirty_rects)
+        
+        self.frame_times.append(time.perf_counter() - frame_start)
+        return cells
+    
+    def run_episode(self, writer=None):
         self.env.reset()
         self.path = []
         self.episode_count += 1
         self.current_episode_score = 0.0
+        self.render_background()
         
         step = 0
         episode_done = False
+        previous_cells = set()
         
-        while step < Config.MAX_STEPS_PER_EPISODE and not episode_done and self.running:
-            if not self.handle_events():
+        while step < self.max_steps and not episode_done and self.running:
+            if writer is None and not self.handle_events():
                 return False
             
             if not self.paused:
@@ -188,18 +299,20 @@ class MazeVisualizer:
                 step += 1
                 episode_done = done
             
-            self.draw_maze()
-            self.draw_agents()
-            self.draw_score_panel()
-            self.draw_pause_indicator()
-            
-            pygame.display.flip()
-            self.clock.tick(Config.FPS)
+            previous_cells = self.draw_frame(previous_cells)
+            if writer is None:
+                self.clock.tick(self.fps)
+            else:
+                writer.capture(self.screen)
+        
+        # fereastra n-step si urmele se golesc inainte de urmatorul reset
+        self.agent.end_episode()
         
         if self.running:
             success = (self.env.cat_pos == self.env.mouse_pos)
             self.update_score(self.env.total_reward, success)
-            self.show_episode_result(success)
+            if writer is None:
+                self.show_episode_result(success)
         
         return self.running
     
@@ -211,15 +324,14 @@ class MazeVisualizer:
             result_text = f"Timp expirat. Scor: {self.current_episode_score:.1f}"
             result_color = (200, 100, 100)
         
-        overlay = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(self.result_overlay, (0, 0))
         
-        result_surface = self.small_font.render(result_text, True, result_color)
+        result_surface = self.render_text(self.small_font, result_text, result_color)
         text_rect = result_surface.get_rect(center=(self.screen_width//2, self.screen_height//2 - 10))
         self.screen.blit(result_surface, text_rect)
         
         pygame.display.flip()
+        self.full_redraw = True
         pygame.time.wait(1000)
     
     def run_training_visualization(self, num_episodes=50):
@@ -233,6 +345,116 @@ class MazeVisualizer:
         self.show_final_results(num_episodes)
         pygame.quit()
     
+    def play_snapshot(self, snapshot, writer=None):
+        view = EpisodeView(snapshot.maze, snapshot.exploration_rate)
+        self.env = view
+        self.agent = view
+        
+        self.episode_count = snapshot.episodes_done
+        self.success_count = snapshot.success_count
+        self.total_score = snapshot.total_score
+        self.best_score = snapshot.best_score
+        
+        self.path = []
+        self.render_background()
+        previous_cells = set()
+        
+        step = 0
+        while step < len(snapshot.cat_path) and self.running:
+            if writer is None:
+                if not self.handle_events():
+                    return False
+                if self.seek_delta is not None:
+                    break
+            
+            if not self.paused:
+                view.cat_pos = snapshot.cat_path[step]
+                view.mouse_pos = snapshot.mouse_path[step]
+                view.steps = step
+                view.total_reward += snapshot.rewards[step]
+                self.update_path()
+                step += 1
+            
+            previous_cells = self.draw_frame(previous_cells)
+            if writer is None:
+                self.clock.tick(self.fps)
+            else:
+                writer.capture(self.screen)
+        
+        self.current_episode_score = view.total_reward
+        return self.running
+    
+    def run_snapshot_visualization(self, background):
+        background.start()
+        last_episode = None
+        
+        while self.running:
+            snapshot = background.latest
+            if snapshot is not None and snapshot.episode != last_episode:
+                last_episode = snapshot.episode
+                if not self.play_snapshot(snapshot):
+                    break
+            elif background.finished:
+                break
+            else:
+                if not self.handle_events():
+                    break
+                self.clock.tick(self.fps)
+        
+        background.stop()
+        
+        stats = background.trainer.training_stats
+        if stats.count:
+            self.episode_count = stats.count
+            self.success_count = int(stats.totals['success'])
+            self.total_score = stats.totals['reward']
+            self.best_score = stats.maximums['reward']
+        
+        self.show_final_results(self.episode_count)
+        pygame.quit()
+    
+    @classmethod
+    def for_replay(cls, log, config=DEFAULT_CONFIG, offscreen=False):
+        # un jurnal gol (antrenare abia pornita) primeste un labirint liber de dimensiunea din configuratie
+        if len(log):
+            maze = np.array(log.maze(0))
+        else:
+            maze = np.zeros((config.MAZE_HEIGHT, config.MAZE_WIDTH), dtype=np.int8)
+        view = EpisodeView(maze)
+        return cls(view, view, config, offscreen)
+    
+    def run_replay_visualization(self, log, start=0):
+        self.seekable = True
+        index = start
+        
+        while self.running and len(log):
+            index = min(max(index, 0), len(log) - 1)
+            self.seek_delta = None
+            if not self.play_snapshot(log.snapshot(index)):
+                break
+            
+            if self.seek_delta is not None:
+                index += self.seek_delta
+                continue
+            
+            index += 1
+            # jurnalul poate fi inca scris de o antrenare in curs
+            if index >= len(log) and log.refresh() <= index:
+                break
+        
+        self.show_final_results(self.episode_count)
+        pygame.quit()
+    
+    def export_training(self, writer, num_episodes=50):
+        # fara evenimente, clock.tick sau pauze: fiecare pas devine imediat un cadru
+        for episode in range(num_episodes):
+            self.run_episode(writer)
+    
+    def export_replay(self, writer, log, start=0, count=None):
+        end = len(log) if count is None else min(len(log), start + count)
+        for index in range(start, end):
+            self.play_snapshot(log.snapshot(index), writer)
+    
     def show_final_results(self, num_episodes):
         print("\nREZULTATE FINALE:")
         print(f"Episoade: {self.episode_count}")
@@ -243,6 +465,13 @@ class MazeVisualizer:
         success_rate = (self.success_count / self.episode_count * 100) if self.episode_count > 0 else 0
         print(f"Rata succes: {success_rate:.1f}%")
         
+        if self.frame_times:
+            frame_ms = np.array(self.frame_times) * 1000
+            print(f"Timp randare/cadru: medie {frame_ms.mean():.2f} ms, p99 {np.percentile(frame_ms, 99):.2f} ms")
+        
+        if self.offscreen:
+            return
+        
         while self.running:
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
@@ -254,9 +483,7 @@ class MazeVisualizer:
             self.draw_agents()
             self.draw_score_panel()
             
-            overlay = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
-            overlay.fill((0, 0, 60, 220))
-            self.screen.blit(overlay, (0, 0))
+            self.screen.blit(self.final_overlay, (0, 0))
             
             success_rate = (self.success_count / self.episode_count * 100) if self.episode_count > 0 else 0
             
@@ -288,7 +515,7 @@ class MazeVisualizer:
                     color = (220, 220, 255)
                     font_size = self.small_font
                 
-                text_surface = font_size.render(stat, True, color)
+                text_surface = self.render_text(font_size, stat, color)
                 text_rect = text_surface.get_rect(
                     center=(self.screen_width//2, 
                            self.screen_height//2 - 100 + i * 28)